@@ -0,0 +1,142 @@
+"""
+Аналітика днів народження по всій книзі контактів (NumPy)
+
+Дати народження один раз збираються у масиви (рік, місяць, день, прапорець
+високосного року), після чого найближчі дні народження, правило 29 лютого,
+дні тижня та гістограми рахуються векторно — без циклу по Record.
+
+NumPy — необов'язкова залежність: імпортується лише при першому зверненні
+до аналітики (команда birthday-stats), решта застосунку працює без неї.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+from models import AddressBook
+
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# date.toordinal() для 1970-01-01 — початок відліку numpy.datetime64
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# 1970-01-01 — четвер (Monday = 0)
+_EPOCH_WEEKDAY = 3
+
+
+def _numpy() -> Any:
+    """Імпортувати NumPy або повідомити, як її встановити."""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Birthday analytics requires NumPy: pip install numpy") from None
+    return numpy
+
+
+def _is_leap(years: Any) -> Any:
+    """Високосність року (працює і для чисел, і для масивів)."""
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+@dataclass
+class BirthdayArrays:
+    """Дні народження книги контактів у вигляді масивів NumPy (по елементу на контакт)."""
+
+    keys: List[str]
+    year: Any
+    month: Any
+    day: Any
+    leap: Any  # рік народження високосний
+
+    @classmethod
+    def from_book(cls, book: AddressBook) -> "BirthdayArrays":
+        """Зібрати масиви з контактів, у яких є день народження."""
+        np = _numpy()
+        keys: List[str] = []
+        ordinals: List[int] = []
+        for key, rec in book.data.items():
+            if rec.birthday is not None:
+                keys.append(key)
+                ordinals.append(rec.birthday.ordinal)
+        days = (np.asarray(ordinals, dtype=np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+        months = days.astype("datetime64[M]")
+        year = months.astype(np.int64) // 12 + 1970
+        return cls(
+            keys=keys,
+            year=year,
+            month=months.astype(np.int64) % 12 + 1,
+            day=(days - months.astype("datetime64[D]")).astype(np.int64) + 1,
+            leap=_is_leap(year),
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _in_year(self, year: int) -> Any:
+        """
+        Дати днів народження у вказаному році (datetime64[D]).
+
+        Як і Record.get_next_birthday(): 29 лютого в невисокосний рік — 1 березня.
+        """
+        np = _numpy()
+        month, day = self.month, self.day
+        if not _is_leap(year):
+            feb29 = (month == 2) & (day == 29)
+            month = np.where(feb29, 3, month)
+            day = np.where(feb29, 1, day)
+        months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+        return months.astype("datetime64[D]") + (day - 1)
+
+    def next_birthdays(self, today: date) -> Tuple[Any, Any]:
+        """(дата наступного дня народження, днів до нього) для кожного контакта."""
+        np = _numpy()
+        today64 = np.datetime64(today, "D")
+        nxt = self._in_year(today.year)
+        passed = nxt < today64
+        if passed.any():
+            nxt = np.where(passed, self._in_year(today.year + 1), nxt)
+        return nxt, (nxt - today64).astype(np.int64)
+
+    def upcoming(self, today: date, days: int) -> List[Tuple[int, str]]:
+        """(днів_до, ключ) для днів народження у вікні [today, today + days], за датою та ключем."""
+        np = _numpy()
+        _, delta = self.next_birthdays(today)
+        idx = np.nonzero(delta <= days)[0]
+        return sorted((int(delta[i]), self.keys[i]) for i in idx)
+
+    def ages(self, today: date) -> Any:
+        """Вік кожного контакта на дату today."""
+        np = _numpy()
+        reached = self._in_year(today.year) <= np.datetime64(today, "D")
+        return today.year - self.year - (~reached).astype(np.int64)
+
+
+def birthday_stats(book: AddressBook, today: date, days: int) -> Dict[str, Any]:
+    """
+    Зведена статистика днів народження:
+    - total — контактів з днем народження
+    - per_month — кількість за місяцями (12 значень)
+    - leap_day — народжених 29 лютого
+    - ages — {десятиліття: кількість} (0 → 0–9 років, 10 → 10–19, ...)
+    - upcoming — днів народження у наступні days днів
+    - per_weekday — ці дні народження за днями тижня (7 значень, з понеділка)
+    """
+    np = _numpy()
+    arrays = BirthdayArrays.from_book(book)
+    if not len(arrays):
+        return {"total": 0}
+    nxt, delta = arrays.next_birthdays(today)
+    window = delta <= days
+    weekday = (nxt[window].astype(np.int64) + _EPOCH_WEEKDAY) % 7
+    decades = np.clip(arrays.ages(today), 0, None) // 10
+    age_counts = np.bincount(decades)
+    return {
+        "total": len(arrays),
+        "per_month": np.bincount(arrays.month, minlength=13)[1:].tolist(),
+        "leap_day": int(((arrays.month == 2) & (arrays.day == 29)).sum()),
+        "ages": {int(d) * 10: int(c) for d, c in enumerate(age_counts) if c},
+        "upcoming": int(window.sum()),
+        "per_weekday": np.bincount(weekday, minlength=7).tolist(),
+    }
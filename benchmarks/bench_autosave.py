@@ -0,0 +1,59 @@
+"""
+Бенчмарк затримки команд, що змінюють дані
+
+Порівнює час однієї команди add-contact на книзі з N контактами:
+- синхронний запис (persist_changes() пише на диск одразу після команди)
+- фоновий запис (background_saves(): команда лише позначає зміни)
+
+Щоб показати найгірший випадок, журнал вимикається — кожен запис є повним
+знімком, як під час ущільнення журналу.
+
+Запуск (з кореня проєкту; дані пишуться у тимчасову HOME):
+    python benchmarks/bench_autosave.py           — 200 000 контактів, 10 команд
+    python benchmarks/bench_autosave.py 1000000 20
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def run(commands: int, label: str, storage) -> float:  # type: ignore[no-untyped-def]
+    from cli import execute_line
+
+    started = time.perf_counter()
+    for i in range(commands):
+        execute_line(f'add-contact "{label} {i}" {i:010d}', storage)
+    return (time.perf_counter() - started) / commands * 1000
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    commands = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        from datagen import make_book
+        import storage as st
+
+        st.JOURNAL_ENABLED = False
+        st.save_storage(st.Storage(contacts=make_book(n)))
+        storage = st.open_storage()
+        storage.contacts  # завантаження не враховуємо
+
+        print(f"{n} contacts, {commands} add-contact commands")
+        print(f"synchronous save:  {run(commands, 'Sync', storage):9.2f} ms/command")
+        started = time.perf_counter()
+        with st.background_saves(storage):
+            print(f"background writer: {run(commands, 'Background', storage):9.2f} ms/command")
+        print(f"final flush on exit: {(time.perf_counter() - started) * 1000:.0f} ms total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Бенчмарк пошуку найближчих днів народження
+
+Порівнює три способи отримати дні народження у наступні N днів:
+- цикл по Record.get_next_birthday() (як раніше робив upcoming_birthdays)
+- AddressBook.upcoming_birthdays() через календарний індекс
+- векторний BirthdayArrays.upcoming() з analytics.py (потрібна NumPy)
+
+і перевіряє, що результати збігаються.
+
+Запуск (з кореня проєкту):
+    python benchmarks/bench_birthdays.py              — 200 000 контактів, 365 днів
+    python benchmarks/bench_birthdays.py 1000000 30
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datagen import make_book  # noqa: E402
+from models import AddressBook  # noqa: E402
+
+Result = List[Tuple[int, str]]
+
+
+def record_loop(book: AddressBook, today: date, days: int) -> Result:
+    out = []
+    for key, rec in book.data.items():
+        delta = rec.days_to_birthday(today)
+        if delta is not None and delta <= days:
+            out.append((delta, key))
+    return sorted(out)
+
+
+def calendar(book: AddressBook, today: date, days: int) -> Result:
+    book._birthday_index = None  # рахуємо й побудову індексу
+    bucket = book.upcoming_birthdays(days, today)
+    return sorted(
+        (delta, name.lower()) for delta, items in bucket.items() for name, _, _ in items
+    )
+
+
+def vectorized(book: AddressBook, today: date, days: int) -> Result:
+    from analytics import BirthdayArrays
+
+    return BirthdayArrays.from_book(book).upcoming(today, days)
+
+
+def record_loop_stats(book: AddressBook, today: date, days: int) -> None:
+    """Ті самі звіти, що й birthday_stats(), циклом по Record."""
+    per_month = [0] * 12
+    per_weekday = [0] * 7
+    ages: Dict[int, int] = {}
+    for rec in book.data.values():
+        if rec.birthday is None:
+            continue
+        born = rec.birthday.as_date()
+        per_month[born.month - 1] += 1
+        nxt = rec.get_next_birthday(today)
+        if (nxt - today).days <= days:
+            per_weekday[nxt.weekday()] += 1
+        age = nxt.year - born.year - (1 if nxt > today else 0)
+        ages[age // 10] = ages.get(age // 10, 0) + 1
+
+
+def timed(label: str, func: Callable[[], Result]) -> Result:
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {(time.perf_counter() - started) * 1000:8.1f} ms  ({len(result)} found)")
+    return result
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+    book = make_book(n)
+    # 29 лютого у невисокосний рік — найскладніший випадок
+    today = date(2027, 2, 20)
+    print(f"{n} contacts, next {days} days from {today}")
+
+    expected = timed("Record loop", lambda: record_loop(book, today, days))
+    assert timed("calendar index (with build)", lambda: calendar(book, today, days)) == expected
+    assert timed("numpy (with array build)", lambda: vectorized(book, today, days)) == expected
+
+    from analytics import birthday_stats
+
+    for label, func in (
+        ("stats: Record loop", record_loop_stats),
+        ("stats: numpy birthday_stats", birthday_stats),
+    ):
+        started = time.perf_counter()
+        func(book, today, days)
+        print(f"{label:<28} {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Бенчмарк формату знімка: pickle проти бінарного формату (binformat.py)
+
+Для кожного розміру книги записує знімок у тимчасовий файл і вимірює
+розмір файлу, час запису та час читання (до готових книг у пам'яті):
+- pickle — формат знімка до binformat (заголовок + pickle)
+- binary — без стиснення, з zlib та з lzma
+
+Запуск (з кореня проєкту):
+    python benchmarks/bench_format.py                   — 10 000 та 100 000 контактів
+    python benchmarks/bench_format.py 10000 100000 1000000
+    python benchmarks/bench_format.py 1000000 --no-lzma — lzma на мільйоні довго стискає
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, List
+import gc
+import os
+import pickle
+import sys
+import tempfile
+import time
+import zlib
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datagen import make_book  # noqa: E402
+from binformat import read_books, write_books  # noqa: E402
+from models import AddressBook, NoteBook  # noqa: E402
+from storage import SNAPSHOT_HEADER, SNAPSHOT_MAGIC, Storage  # noqa: E402
+
+
+def save_pickle(path: Path, book: AddressBook) -> None:
+    payload = pickle.dumps(Storage(contacts=book, notes=NoteBook()), protocol=pickle.HIGHEST_PROTOCOL)
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(payload), zlib.crc32(payload)))
+        f.write(payload)
+
+
+def load_pickle(path: Path) -> None:
+    raw = path.read_bytes()
+    payload = memoryview(raw)[SNAPSHOT_HEADER.size:]
+    zlib.crc32(payload)
+    pickle.loads(payload)
+
+
+def save_binary(compression: str) -> Callable[[Path, AddressBook], None]:
+    def save(path: Path, book: AddressBook) -> None:
+        with open(path, "wb") as f:
+            write_books(f, book, NoteBook(), compression)
+    return save
+
+
+def load_binary(path: Path) -> None:
+    with open(path, "rb") as f:
+        read_books(f)
+
+
+def timed(func: Callable[[], None]) -> float:
+    gc.collect()
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    sizes: List[int] = [int(a) for a in args] or [10_000, 100_000]
+    formats = [
+        ("pickle", save_pickle, load_pickle),
+        ("binary", save_binary("none"), load_binary),
+        ("binary+zlib", save_binary("zlib"), load_binary),
+        ("binary+lzma", save_binary("lzma"), load_binary),
+    ]
+    if "--no-lzma" in sys.argv:
+        formats.pop()
+
+    print(f"{'contacts':>9} {'format':<12} {'size MB':>8} {'save s':>7} {'load s':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            book = make_book(n)
+            for label, save, load in formats:
+                path = Path(tmp) / label
+                save_time = timed(lambda: save(path, book))
+                load_time = timed(lambda: load(path))
+                size = os.path.getsize(path) / 1e6
+                print(f"{n:>9} {label:<12} {size:8.2f} {save_time:7.2f} {load_time:7.2f}")
+                path.unlink()
+
+
+if __name__ == "__main__":
+    main()
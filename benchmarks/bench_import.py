@@ -0,0 +1,44 @@
+"""
+Бенчмарк масового імпорту контактів
+
+Генерує CSV/JSONL/vCard файл з N контактами у тимчасовій директорії
+та вимірює швидкість import_contacts() (записів за секунду).
+
+Запуск (з кореня проєкту):
+    python benchmarks/bench_import.py            — 1 000 000 рядків CSV
+    python benchmarks/bench_import.py 100000 vcf
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datagen import make_book  # noqa: E402
+from models import AddressBook  # noqa: E402
+from transfer import export_contacts, import_contacts  # noqa: E402
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fmt = sys.argv[2] if len(sys.argv) > 2 else "csv"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"contacts.{fmt}"
+        count = export_contacts(make_book(n), path)
+        size_mb = path.stat().st_size / 1e6
+
+        started = time.perf_counter()
+        result = import_contacts(AddressBook(), path)
+        elapsed = time.perf_counter() - started
+
+        print(f"{fmt}: {count} rows, {size_mb:.1f} MB")
+        print(f"import: {result.total} contacts in {elapsed:.2f} s — {result.total / elapsed:.0f} rec/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Бенчмарк пам'яті на один контакт/нотатку
+
+Будує книгу з N контактів та записну книжку з N нотаток і вимірює
+(через tracemalloc) байти пам'яті та розмір pickle на один запис.
+
+Запуск (з кореня проєкту):
+    python benchmarks/bench_memory.py          — 100 000 записів
+    python benchmarks/bench_memory.py 1000000
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import gc
+import pickle
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datagen import make_book, make_notes  # noqa: E402
+
+
+def measure(label: str, n: int, build) -> None:  # type: ignore[no-untyped-def]
+    gc.collect()
+    tracemalloc.start()
+    obj = build(n)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    print(f"{label:<9} memory: {current / n:7.0f} B/record   pickle: {size / n:6.0f} B/record")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{n} records")
+    measure("contacts", n, make_book)
+    measure("notes", n, lambda count: make_notes(count, words=5))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Бенчмарк відкриття лише для читання (--read-only)
+
+Порівнює час «відкрити сховище і знайти один контакт» на книзі з N
+контактами (бінарний знімок без стиснення):
+- load()            — повне читання знімка, як у звичайному режимі
+- load_read_only()  — знімок відображається в пам'ять, декодується лише знайдений запис
+
+Запуск (з кореня проєкту; дані пишуться у тимчасову HOME):
+    python benchmarks/bench_read_only.py           — 100 000 контактів
+    python benchmarks/bench_read_only.py 1000000
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import gc
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        from datagen import make_book
+        import storage as st
+
+        book = make_book(n)
+        name = book.data[f"person {n // 2}"].name.value
+        # Відображення в пам'ять працює лише з бінарним знімком
+        st.SNAPSHOT_FORMAT = "binary"
+        st.save_storage(st.Storage(contacts=book))
+        del book
+        gc.collect()
+
+        print(f"{n} contacts, {os.path.getsize(st.STORAGE_FILE) / 1e6:.1f} MB snapshot")
+        for label, load in (("full load", "load"), ("read-only (mmap)", "load_read_only")):
+            started = time.perf_counter()
+            storage = getattr(st.PickleBackend(), load)()
+            opened = time.perf_counter()
+            storage.contacts.get_record(name)
+            found = time.perf_counter()
+            print(
+                f"{label:<17} open {(opened - started) * 1000:9.1f} ms, "
+                f"first lookup {(found - opened) * 1000:7.3f} ms"
+            )
+            del storage
+            gc.collect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Генератори синтетичних даних для бенчмарків
+
+Дані детерміновані (той самий n — ті самі записи), тож результати
+різних запусків і комітів можна порівнювати між собою:
+- make_book(n)      — контакти "Person i" з телефонами, email, адресами та днями народження
+- make_notes(n)     — нотатки "Note i" з тегами та довгим текстом
+- make_storage(n, m) — обидві книги в одному Storage
+
+Модуль не імпортує storage на рівні модуля: бенчмарки задають HOME
+(тимчасову директорію даних) до першого імпорту storage.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import Address, AddressBook, Birthday, Email, Name, Note, NoteBook, Phone, Record  # noqa: E402
+
+if TYPE_CHECKING:
+    from storage import Storage
+
+# Словник для тексту нотаток: часті та рідкісні слова, як у справжніх нотатках
+WORDS = (
+    "meeting project budget call report review plan deadline client invoice "
+    "travel ticket hotel doctor dentist school homework garden repair car "
+    "insurance tax bank payment salary gift birthday party dinner recipe "
+    "book film music concert gym training run swim yoga vacation beach "
+    "mountain museum library passport visa embassy contract lawyer notary"
+).split()
+
+NOTE_TAGS = 50
+NOTES_START = datetime(2026, 1, 1)
+
+
+def make_book(n: int) -> AddressBook:
+    """
+    Книга з n контактами: у кожного телефон, у кожного четвертого — другий,
+    у кожного другого — email, у кожного третього — адреса,
+    у кожного п'ятого — день народження.
+    """
+    book = AddressBook()
+    for i in range(n):
+        rec = Record(Name(f"Person {i}"))
+        rec.add_phone(Phone(f"{i:010d}"))
+        if i % 4 == 0:
+            rec.add_phone(Phone(f"{9_000_000_000 + i:010d}"))
+        if i % 2:
+            rec.add_email(Email(f"person{i}@example.com"))
+        if i % 3 == 0:
+            rec.set_address(Address(f"Kyiv, Street {i}"))
+        if i % 5 == 0:
+            rec.set_birthday(Birthday(f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.1990"))
+        book.data[rec.name.value.lower()] = rec
+    return book
+
+
+def make_notes(n: int, words: int = 80, seed: int = 0) -> NoteBook:
+    """
+    Записна книжка з n нотаток по words слів тексту, з тегом tag{i % 50}
+    та спільним тегом "common"; нотатки створено щохвилини з NOTES_START.
+    """
+    rng = random.Random(seed)
+    notes = NoteBook()
+    for i in range(n):
+        text = " ".join(rng.choices(WORDS, k=words))
+        note = Note(title=f"Note {i}", text=text, created=NOTES_START + timedelta(minutes=i))
+        note.add_tags(f"tag{i % NOTE_TAGS}", "common")
+        notes.data[note.title.lower()] = note
+    return notes
+
+
+def make_storage(contacts: int, notes: int = 0) -> Storage:
+    """Сховище з contacts контактами та notes нотатками."""
+    from storage import Storage
+
+    return Storage(contacts=make_book(contacts), notes=make_notes(notes))
@@ -0,0 +1,363 @@
+"""
+Набір бенчмарків моделей, сховища та виконання команд з результатами у JSON
+
+Для кожного розміру (N контактів і N * --notes-ratio нотаток, дані з
+datagen.py) вимірює:
+- contacts.*    — AddressBook.search, upcoming_birthdays, get_contact_names
+                  (автодоповнення): «cold» — з побудовою індексу, «warm» — запит
+                  до вже побудованого індексу
+- notes.*       — NoteBook.search_text, search_tag (cold/warm)
+- storage.*     — save_storage()/load_storage() у тимчасовій директорії даних
+- dispatch.*    — рядок команди → parse_input → REG → обробник → вивід
+                  (як у пакетному режимі; зміни записуються в журнал)
+
+Кожен кейс повторюється --repeat разів; у результаті — найкращий час та
+медіана (на одну операцію, якщо кейс виконує кілька). Результати разом
+з комітом, версією Python та налаштуваннями сховища записуються в JSON,
+а --compare порівнює два такі файли і повертає 1, якщо щось сповільнилось
+більше ніж на --threshold. Порівнювати варто запуски з однаковими --sizes,
+--notes-ratio та --only: кейси виконуються послідовно над тими самими даними.
+
+Запуск (з кореня проєкту; дані пишуться у тимчасову HOME):
+    python benchmarks/suite.py                          — 1 000, 10 000, 100 000 контактів
+    python benchmarks/suite.py --sizes 10000 1000000 --repeat 3
+    python benchmarks/suite.py --only notes. --output before.json
+    python benchmarks/suite.py --compare before.json after.json
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+FORMAT_VERSION = 1
+
+# Фіксована дата: результати upcoming_birthdays не залежать від дня запуску
+TODAY = date(2027, 2, 20)
+BIRTHDAY_DAYS = 30
+
+# Кількість операцій у «warm»-кейсах та кейсах dispatch
+QUERIES = 100
+COMMANDS = 200
+
+
+class Context(NamedTuple):
+    storage: Any  # storage.Storage з даними datagen
+    contacts: int
+    notes: int
+
+
+# Кейс: назва та підготовка, яка перед кожним повтором повертає вимірювану дію
+# і кількість операцій у ній
+Setup = Callable[[Context], Tuple[Callable[[], Any], int]]
+CASES: List[Tuple[str, Setup]] = []
+
+
+def case(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        CASES.append((name, setup))
+        return setup
+    return register
+
+
+def _queries(ctx: Context, template: str) -> List[str]:
+    """QUERIES запитів до різних записів книги (template із {i})."""
+    step = max(ctx.contacts // QUERIES, 1)
+    return [template.format(i=i * step) for i in range(QUERIES)]
+
+
+# ==============================
+# Контакти
+# ==============================
+
+
+@case("contacts.search.cold")
+def contacts_search_cold(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    book = ctx.storage.contacts
+    book.reset_indexes()
+    return lambda: book.search(f"person {ctx.contacts // 2}"), 1
+
+
+@case("contacts.search.warm")
+def contacts_search_warm(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    book = ctx.storage.contacts
+    book.search("")
+    queries = _queries(ctx, "erson {i}")
+    return lambda: [book.search(q) for q in queries], len(queries)
+
+
+@case("contacts.upcoming_birthdays.cold")
+def birthdays_cold(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    book = ctx.storage.contacts
+    book.reset_indexes()
+    return lambda: book.upcoming_birthdays(BIRTHDAY_DAYS, TODAY), 1
+
+
+@case("contacts.upcoming_birthdays.warm")
+def birthdays_warm(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    book = ctx.storage.contacts
+    book.upcoming_birthdays(BIRTHDAY_DAYS, TODAY)
+    return lambda: [book.upcoming_birthdays(BIRTHDAY_DAYS, TODAY) for _ in range(QUERIES)], QUERIES
+
+
+@case("contacts.get_contact_names.cold")
+def names_cold(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    from completion import get_contact_names
+
+    ctx.storage.contacts.reset_indexes()
+    return lambda: get_contact_names(ctx.storage, "person 1"), 1
+
+
+@case("contacts.get_contact_names.warm")
+def names_warm(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    from completion import get_contact_names
+
+    get_contact_names(ctx.storage, "")
+    prefixes = _queries(ctx, "Person {i}")
+    return lambda: [get_contact_names(ctx.storage, p) for p in prefixes], len(prefixes)
+
+
+# ==============================
+# Нотатки
+# ==============================
+
+
+NOTE_QUERIES = ["budget", "doctor AND visa", "travel OR hotel", "mount*", '"birthday party"']
+
+
+@case("notes.search_text.cold")
+def notes_text_cold(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    notes = ctx.storage.notes
+    notes.reset_indexes()
+    return lambda: notes.search_text("budget"), 1
+
+
+@case("notes.search_text.warm")
+def notes_text_warm(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    notes = ctx.storage.notes
+    notes.search_text("budget")
+    return lambda: [notes.search_text(q) for q in NOTE_QUERIES], len(NOTE_QUERIES)
+
+
+@case("notes.search_tag.cold")
+def notes_tag_cold(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    notes = ctx.storage.notes
+    notes.reset_indexes()
+    return lambda: notes.search_tag("tag7"), 1
+
+
+@case("notes.search_tag.warm")
+def notes_tag_warm(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    notes = ctx.storage.notes
+    notes.search_tag("tag7")
+    tags = [f"tag{i}" for i in range(50)]
+    return lambda: [notes.search_tag(t) for t in tags], len(tags)
+
+
+# ==============================
+# Сховище
+# ==============================
+
+
+@case("storage.save")
+def storage_save(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    from storage import save_storage
+
+    return lambda: save_storage(ctx.storage), 1
+
+
+@case("storage.load")
+def storage_load(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    from storage import STORAGE_FILE, load_storage, save_storage
+
+    if not STORAGE_FILE.exists():
+        save_storage(ctx.storage)
+    return load_storage, 1
+
+
+# ==============================
+# Виконання команд
+# ==============================
+
+
+def _dispatch(ctx: Context, lines: List[str]) -> Tuple[Callable[[], Any], int]:
+    from cli import execute_line, format_output
+
+    def run() -> None:
+        for line in lines:
+            # Вивід споживається повністю: великі списки — ітератори рядків
+            for _ in format_output(execute_line(line, ctx.storage)):
+                pass
+    return run, len(lines)
+
+
+@case("dispatch.show-phone")
+def dispatch_show(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    return _dispatch(ctx, _queries(ctx, 'show-phone "Person {i}"'))
+
+
+@case("dispatch.find-contact")
+def dispatch_find(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    ctx.storage.contacts.search("")
+    return _dispatch(ctx, _queries(ctx, "find-contact person {i} --limit 10"))
+
+
+@case("dispatch.find-note")
+def dispatch_find_note(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    ctx.storage.notes.search_text("budget")
+    return _dispatch(ctx, [f"find-note {q}" for q in NOTE_QUERIES])
+
+
+@case("dispatch.add-delete-contact")
+def dispatch_mutate(ctx: Context) -> Tuple[Callable[[], Any], int]:
+    # Пари команд залишають книгу незмінною між повторами; кожна пише в журнал
+    lines = []
+    for i in range(COMMANDS // 2):
+        lines += [f'add-contact "Bench {i}" {i:010d}', f'delete-contact "Bench {i}"']
+    return _dispatch(ctx, lines)
+
+
+# ==============================
+# Запуск і результати
+# ==============================
+
+
+def measure(ctx: Context, setup: Setup, repeat: int) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        action, ops = setup(ctx)
+        gc.collect()
+        started = time.perf_counter()
+        action()
+        runs.append((time.perf_counter() - started) / ops)
+    return {"best": min(runs), "median": statistics.median(runs), "ops": ops, "runs": runs}
+
+
+def git_revision() -> Dict[str, Any]:
+    """Поточний коміт та чи є незакомічені зміни (None — не git-репозиторій)."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": bool(status.strip())}
+
+
+def run_suite(sizes: List[int], notes_ratio: float, repeat: int, only: Optional[str]) -> Dict[str, Any]:
+    import config
+    from datagen import make_storage
+
+    cases = [(name, setup) for name, setup in CASES if only is None or only in name]
+    results = []
+    for n in sizes:
+        m = int(n * notes_ratio)
+        ctx = Context(make_storage(n, m), n, m)
+        print(f"{n} contacts, {m} notes", file=sys.stderr)
+        for name, setup in cases:
+            result = measure(ctx, setup, repeat)
+            results.append({"case": name, "contacts": n, "notes": m, **result})
+            print(f"  {name:<36} {_format_time(result['best']):>10}  (median {_format_time(result['median'])})",
+                  file=sys.stderr)
+        del ctx
+    return {
+        "format": FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        **git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "config": {
+            key: getattr(config, key)
+            for key in ("STORAGE_BACKEND", "JOURNAL_ENABLED", "SNAPSHOT_FORMAT", "SNAPSHOT_COMPRESSION")
+        },
+        "results": results,
+    }
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def compare(old_path: Path, new_path: Path, threshold: float) -> int:
+    """Порівняти два файли результатів; 1 — є сповільнення більше ніж на threshold."""
+    old, new = (json.loads(p.read_text(encoding="utf-8")) for p in (old_path, new_path))
+    baseline = {(r["case"], r["contacts"], r["notes"]): r["best"] for r in old["results"]}
+    print(f"old: {old.get('commit') or '?'}  new: {new.get('commit') or '?'}")
+    print(f"{'case':<36} {'contacts':>9} {'old':>10} {'new':>10} {'ratio':>6}")
+    regressions = 0
+    for r in new["results"]:
+        before = baseline.get((r["case"], r["contacts"], r["notes"]))
+        if before is None:
+            continue
+        ratio = r["best"] / before if before else float("inf")
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "  slower"
+            regressions += 1
+        elif ratio < 1 / (1 + threshold):
+            mark = "  faster"
+        print(f"{r['case']:<36} {r['contacts']:>9} {_format_time(before):>10} {_format_time(r['best']):>10} "
+              f"{ratio:6.2f}{mark}")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite: models, storage, command dispatch")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], metavar="N",
+                        help="number of contacts for each point of the scaling curve")
+    parser.add_argument("--notes-ratio", type=float, default=0.5, metavar="R",
+                        help="notes per contact (default: 0.5)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the best one is compared")
+    parser.add_argument("--only", metavar="TEXT", help="run only cases whose name contains TEXT")
+    parser.add_argument("--output", type=Path, metavar="FILE",
+                        help="results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two results files instead of running")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown reported as a regression (default: 0.2)")
+    opts = parser.parse_args(argv)
+
+    if opts.compare:
+        return compare(*opts.compare, opts.threshold)
+
+    with tempfile.TemporaryDirectory() as home:
+        # До першого імпорту storage: дані бенчмарку не чіпають справжню директорію даних
+        os.environ["HOME"] = home
+        report = run_suite(opts.sizes, opts.notes_ratio, opts.repeat, opts.only)
+
+    output = opts.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{stamp}-{(report['commit'] or 'nogit')[:10]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Results: {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,582 @@
+"""
+Бінарний формат знімка даних з версіонованою схемою
+
+На відміну від pickle, файл не залежить від шляхів класів у models.py:
+записи зберігаються як структури (struct) з рядками UTF-8, а об'єкти
+Record/Note створюються читачем. Читач потоковий — записи декодуються
+по одному, без побудови всього графа об'єктів у пам'яті наперед.
+
+Розмітка файлу:
+    HEADER  magic (8 байт) | версія схеми (uint16) | стиснення (uint8)
+    тіло (стиснене zlib/lzma, якщо задано) — послідовність кадрів:
+        FRAME  вид (uint8) | довжина даних (uint32) | дані
+        KIND_CONTACT: CONTACT_HEAD + довжини рядків + рядки
+                      (ім'я, телефони, email, адреса — якщо є)
+        KIND_NOTE:    NOTE_HEAD + довжини рядків + рядки
+                      (назва, текст, дата створення ISO, теги)
+        KIND_END:     TRAILER — кількість контактів, нотаток та CRC32
+                      усіх попередніх кадрів (без стиснення)
+    Довжини рядків (uint32) — у символах, а самі рядки записано одним блоком
+    UTF-8: запис декодується одним викликом decode(), а не по рядку.
+    Записи кожного виду йдуть у порядку ключів (ім'я/назва в нижньому регістрі).
+
+    Лише без стиснення (з версії 2) — індекс після кадру KIND_END:
+        для контактів, потім для нотаток:
+            кількість (uint64) | початки ключів у блоці (n + 1 × uint64)
+            | зсуви кадрів у файлі (n × uint64) | ключі одним блоком UTF-8
+        FOOTER  зсув індексу (uint64) | CRC32 індексу | INDEX_MAGIC
+    За індексом MappedSnapshot знаходить запис двійковим пошуком прямо у
+    відображеному в пам'ять (mmap) файлі і декодує лише його (--read-only).
+
+Міграція схеми: читач декодує записи декодером версії файлу, а функції
+з _MIGRATIONS послідовно доводять «сирі» кортежі до поточної версії.
+Наступний запис знімка вже буде в поточній версії.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from array import array
+from pathlib import Path
+from typing import IO, Any, BinaryIO, Callable, Dict, Iterator, List, MutableMapping, Optional, Set, Tuple, Union
+import gzip
+import lzma
+import mmap
+import struct
+import sys
+import zlib
+
+from models import Address, AddressBook, Birthday, Email, Name, Note, NoteBook, Phone, Record
+
+MAGIC = b"PACLBIN\x00"
+SCHEMA_VERSION = 2
+INDEX_MAGIC = b"PACLIDX\x00"
+
+HEADER = struct.Struct("<8sHB")
+FRAME = struct.Struct("<BI")
+# кількість телефонів, кількість email, чи є адреса, день народження (ordinal, 0 — немає)
+CONTACT_HEAD = struct.Struct("<HHBI")
+# кількість тегів
+NOTE_HEAD = struct.Struct("<H")
+# контактів, нотаток, CRC32 кадрів
+TRAILER = struct.Struct("<QQI")
+# зсув індексу, CRC32 індексу, INDEX_MAGIC
+FOOTER = struct.Struct("<QI8s")
+_U64 = struct.Struct("<Q")
+
+KIND_CONTACT = 1
+KIND_NOTE = 2
+KIND_END = 0xFF
+
+COMPRESSION = {"none": 0, "zlib": 1, "lzma": 2}
+
+# Розмір блоку при читанні/записі тіла
+_CHUNK_SIZE = 1 << 20
+
+# «Сирі» записи, як їх повертає декодер: кортежі рядків і чисел без об'єктів моделей
+RawContact = Tuple[str, List[str], List[str], Optional[str], int]
+RawNote = Tuple[str, str, str, List[str]]
+
+
+def _unchanged(raw: Any) -> Any:
+    return raw
+
+
+# версія → (міграція контакта, міграція нотатки) до версії + 1
+_MIGRATIONS: Dict[int, Tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    1: (_unchanged, _unchanged),  # версія 2 додала лише індекс у кінці файлу
+}
+
+
+def is_binary(path_or_head: Any) -> bool:
+    """Чи є файл (або його перші байти) знімком у бінарному форматі."""
+    if isinstance(path_or_head, (bytes, bytearray, memoryview)):
+        return bytes(path_or_head[:len(MAGIC)]) == MAGIC
+    with open(path_or_head, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+# ==============================
+# Запис
+# ==============================
+
+
+def _strings(head: bytes, strings: List[str]) -> bytes:
+    """Дані кадру: заголовок, довжини рядків (у символах), рядки одним блоком UTF-8."""
+    return head + struct.pack(f"<{len(strings)}I", *map(len, strings)) + "".join(strings).encode("utf-8")
+
+
+def encode_contact(rec: Record) -> bytes:
+    """Кадр одного контакта."""
+    strings = [rec.name.value, *(p.value for p in rec.phones), *(e.value for e in rec.emails)]
+    if rec.address is not None:
+        strings.append(rec.address.value)
+    head = CONTACT_HEAD.pack(
+        len(rec.phones), len(rec.emails), rec.address is not None,
+        rec.birthday.ordinal if rec.birthday is not None else 0,
+    )
+    payload = _strings(head, strings)
+    return FRAME.pack(KIND_CONTACT, len(payload)) + payload
+
+
+def encode_note(note: Note) -> bytes:
+    """Кадр однієї нотатки (теги впорядковано — файл не залежить від порядку множини)."""
+    tags = sorted(note.tags)
+    payload = _strings(NOTE_HEAD.pack(len(tags)), [note.title, note.text, note.created.isoformat(), *tags])
+    return FRAME.pack(KIND_NOTE, len(payload)) + payload
+
+
+def _open_body_writer(f: BinaryIO, compression: str) -> IO[bytes]:
+    if compression == "zlib":
+        return gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6, mtime=0)
+    if compression == "lzma":
+        return lzma.LZMAFile(f, "wb", preset=6)
+    return f
+
+
+def write_books(f: BinaryIO, contacts: AddressBook, notes: NoteBook, compression: str = "none") -> None:
+    """
+    Записати книги у відкритий бінарний файл.
+
+    compression: "none", "zlib" або "lzma" (усі — зі стандартної бібліотеки).
+    Без стиснення після даних дописується індекс ключів для MappedSnapshot.
+    """
+    if compression not in COMPRESSION:
+        raise ValueError(f"Unknown compression: {compression}. Use one of: {', '.join(COMPRESSION)}")
+    f.write(HEADER.pack(MAGIC, SCHEMA_VERSION, COMPRESSION[compression]))
+    body = _open_body_writer(f, compression)
+    buf = bytearray()
+    crc = 0
+    pos = HEADER.size  # зсув наступного кадру у файлі (має сенс лише без стиснення)
+    sections = []
+
+    for book, encode in ((contacts, encode_contact), (notes, encode_note)):
+        keys = sorted(book.data)
+        offsets = array("Q")
+        for key in keys:
+            frame = encode(book.data[key])
+            offsets.append(pos)
+            pos += len(frame)
+            buf += frame
+            if len(buf) >= _CHUNK_SIZE:
+                crc = zlib.crc32(buf, crc)
+                body.write(buf)
+                buf = bytearray()
+        sections.append((keys, offsets))
+    crc = zlib.crc32(buf, crc)
+    trailer = TRAILER.pack(len(contacts.data), len(notes.data), crc)
+    frame = FRAME.pack(KIND_END, len(trailer)) + trailer
+    buf += frame
+    body.write(buf)
+    if body is not f:
+        body.close()  # дописує кінець стисненого потоку, сам файл не закриває
+        return
+    index = _encode_index(sections)
+    f.write(index)
+    f.write(FOOTER.pack(pos + len(frame), zlib.crc32(index), INDEX_MAGIC))
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode_index(sections: List[Tuple[List[str], array]]) -> bytes:
+    """Індекс ключів: для кожного виду записів — ключі (впорядковані) та зсуви їхніх кадрів."""
+    parts = []
+    for keys, offsets in sections:
+        encoded = [key.encode("utf-8") for key in keys]
+        starts = array("Q", [0])
+        total = 0
+        for key in encoded:
+            total += len(key)
+            starts.append(total)
+        parts += [_U64.pack(len(keys)), _little_endian(starts), _little_endian(offsets), b"".join(encoded)]
+    return b"".join(parts)
+
+
+# ==============================
+# Читання
+# ==============================
+
+
+def _strings_at(buf: memoryview, offset: int, count: int) -> List[str]:
+    """count рядків, довжини яких записано з позиції offset, а за ними — блок UTF-8."""
+    lengths = struct.unpack_from(f"<{count}I", buf, offset)
+    blob = str(buf[offset + 4 * count:], "utf-8")
+    out = []
+    pos = 0
+    for n in lengths:
+        out.append(blob[pos:pos + n])
+        pos += n
+    return out
+
+
+def _decode_contact_v1(buf: memoryview) -> RawContact:
+    n_phones, n_emails, has_address, ordinal = CONTACT_HEAD.unpack_from(buf)
+    strings = _strings_at(buf, CONTACT_HEAD.size, 1 + n_phones + n_emails + has_address)
+    address = strings[-1] if has_address else None
+    return strings[0], strings[1:1 + n_phones], strings[1 + n_phones:1 + n_phones + n_emails], address, ordinal
+
+
+def _decode_note_v1(buf: memoryview) -> RawNote:
+    (n_tags,) = NOTE_HEAD.unpack_from(buf)
+    title, text, created, *tags = _strings_at(buf, NOTE_HEAD.size, 3 + n_tags)
+    return title, text, created, tags
+
+
+# версія схеми → (декодер контакта, декодер нотатки)
+_DECODERS: Dict[int, Tuple[Callable[[memoryview], Any], Callable[[memoryview], Any]]] = {
+    1: (_decode_contact_v1, _decode_note_v1),
+    2: (_decode_contact_v1, _decode_note_v1),
+}
+
+
+_new = object.__new__
+
+
+def _field(cls: Any, value: str) -> Any:
+    """
+    Поле з уже перевіреного значення: як і unpickle, без __init__ та повторної
+    валідації (для мільйонів полів це більша частина часу читання).
+    """
+    obj = _new(cls)
+    obj._value = value
+    return obj
+
+
+def build_contact(raw: RawContact) -> Record:
+    """Record із сирого контакта поточної версії схеми."""
+    name, phones, emails, address, ordinal = raw
+    rec = _new(Record)
+    rec.name = _field(Name, name)
+    rec.phones = [_field(Phone, p) for p in phones]
+    rec.emails = [_field(Email, e) for e in emails]
+    rec.address = _field(Address, address) if address is not None else None
+    if ordinal:
+        birthday = _new(Birthday)
+        birthday.__setstate__(ordinal)
+        rec.birthday = birthday
+    else:
+        rec.birthday = None
+    rec._owner = None
+    return rec
+
+
+def build_note(raw: RawNote) -> Note:
+    """Note із сирої нотатки поточної версії схеми."""
+    title, text, created, tags = raw
+    note = _new(Note)
+    note.__setstate__((title, text, tags, datetime.fromisoformat(created)))
+    return note
+
+
+def _iter_frames(body: IO[bytes]) -> Iterator[Tuple[int, memoryview]]:
+    """
+    Кадри тіла по одному (блоками по _CHUNK_SIZE). Наприкінці перевіряє
+    кадр KIND_END: CRC32 та кількість записів; ValueError — файл пошкоджено.
+    """
+    pending = b""
+    crc = 0
+    counts = [0, 0]
+    while True:
+        chunk = body.read(_CHUNK_SIZE)
+        data = pending + chunk if pending else chunk
+        view = memoryview(data)
+        pos, end = 0, len(data)
+        while pos + FRAME.size <= end:
+            kind, length = FRAME.unpack_from(data, pos)
+            start = pos + FRAME.size
+            if start + length > end:
+                break
+            if kind == KIND_END:
+                crc = zlib.crc32(view[:pos], crc)
+                contacts, notes, expected = TRAILER.unpack_from(data, start)
+                if expected != crc or [contacts, notes] != counts:
+                    raise ValueError("Snapshot checksum mismatch")
+                return
+            if kind == KIND_CONTACT:
+                counts[0] += 1
+            elif kind == KIND_NOTE:
+                counts[1] += 1
+            yield kind, view[start:start + length]
+            pos = start + length
+        crc = zlib.crc32(view[:pos], crc)
+        pending = bytes(view[pos:])
+        if not chunk:
+            raise ValueError("Snapshot is truncated")
+
+
+def _open_body_reader(f: BinaryIO, compression: int) -> IO[bytes]:
+    if compression == COMPRESSION["zlib"]:
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    if compression == COMPRESSION["lzma"]:
+        return lzma.LZMAFile(f, "rb")
+    if compression == COMPRESSION["none"]:
+        return f
+    raise ValueError(f"Unknown compression code: {compression}")
+
+
+def read_header(f: BinaryIO) -> Tuple[int, int]:
+    """Прочитати заголовок: (версія схеми, код стиснення)."""
+    raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError("Snapshot is truncated")
+    magic, version, compression = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("Not a binary snapshot")
+    if version not in _DECODERS:
+        raise ValueError(f"Unsupported snapshot schema version: {version}")
+    return version, compression
+
+
+def iter_records(f: BinaryIO) -> Iterator[Tuple[int, Any]]:
+    """
+    Потоково читати знімок: (KIND_CONTACT, Record) або (KIND_NOTE, Note).
+
+    Записи старих версій схеми мігруються до поточної. Пошкоджений файл —
+    ValueError (можливо, вже після частини записів: перевірка CRC — у кінці).
+    """
+    version, compression = read_header(f)
+    decode_contact, decode_note = _DECODERS[version]
+    migrations = [_MIGRATIONS[v] for v in range(version, SCHEMA_VERSION)]
+    for kind, payload in _iter_frames(_open_body_reader(f, compression)):
+        if kind == KIND_CONTACT:
+            raw = decode_contact(payload)
+            for migrate_contact, _ in migrations:
+                raw = migrate_contact(raw)
+            yield kind, build_contact(raw)
+        elif kind == KIND_NOTE:
+            raw = decode_note(payload)
+            for _, migrate_note in migrations:
+                raw = migrate_note(raw)
+            yield kind, build_note(raw)
+        # невідомі види кадрів з новіших версій пропускаються
+
+
+def read_books(f: BinaryIO) -> Tuple[AddressBook, NoteBook]:
+    """Прочитати знімок у нові книги контактів та нотаток."""
+    contacts, notes = AddressBook(), NoteBook()
+    for kind, obj in iter_records(f):
+        if kind == KIND_CONTACT:
+            obj._owner = contacts
+            contacts.data[obj.name.value.lower()] = obj
+        else:
+            obj._owner = notes
+            notes.data[obj.title.strip().lower()] = obj
+    return contacts, notes
+
+
+def checksum_bytes(f: BinaryIO) -> bytes:
+    """
+    Байти з кінця файлу, що містять контрольну суму всього вмісту.
+
+    Без стиснення — кадр KIND_END (CRC32 усіх кадрів) та FOOTER, якщо є індекс;
+    зі стисненням — кінець потоку gzip/xz з контрольною сумою розпакованих даних.
+    """
+    size = f.seek(0, 2)
+    f.seek(max(size - 64, 0))
+    tail = f.read()
+    if len(tail) >= FOOTER.size:
+        index_offset, _, index_magic = FOOTER.unpack_from(tail, len(tail) - FOOTER.size)
+        end_frame = FRAME.size + TRAILER.size
+        if index_magic == INDEX_MAGIC and end_frame <= index_offset <= size:
+            f.seek(index_offset - end_frame)
+            tail = f.read(end_frame) + tail
+    return tail
+
+
+# ==============================
+# Відображення в пам'ять (read-only)
+# ==============================
+
+
+class _KeyIndex:
+    """Індекс одного виду записів у відображеному файлі: впорядковані ключі та зсуви кадрів."""
+
+    __slots__ = ("_mm", "count", "_starts", "_offsets", "_blob", "end")
+
+    def __init__(self, mm: mmap.mmap, pos: int) -> None:
+        self._mm = mm
+        (self.count,) = _U64.unpack_from(mm, pos)
+        self._starts = pos + _U64.size
+        self._offsets = self._starts + 8 * (self.count + 1)
+        self._blob = self._offsets + 8 * self.count
+        (blob_size,) = _U64.unpack_from(mm, self._offsets - 8)
+        self.end = self._blob + blob_size
+
+    def _key(self, i: int) -> bytes:
+        start, end = struct.unpack_from("<QQ", self._mm, self._starts + 8 * i)
+        return self._mm[self._blob + start:self._blob + end]
+
+    def find(self, key: str) -> Optional[int]:
+        """Зсув кадру запису з ключем key (двійковий пошук по байтах UTF-8) або None."""
+        target = key.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._key(lo) == target:
+            return _U64.unpack_from(self._mm, self._offsets + 8 * lo)[0]
+        return None
+
+    def keys(self) -> Iterator[str]:
+        """Усі ключі у порядку індексу, без декодування записів."""
+        starts = array("Q")
+        starts.frombytes(self._mm[self._starts:self._offsets])
+        if sys.byteorder == "big":
+            starts.byteswap()
+        blob = self._mm[self._blob:self.end]
+        # Ключі ASCII (звичайний випадок): зсуви в байтах збігаються зі зсувами в рядку
+        text = blob.decode("ascii") if blob.isascii() else None
+        for i in range(self.count):
+            start, end = starts[i], starts[i + 1]
+            yield text[start:end] if text is not None else str(blob[start:end], "utf-8")
+
+
+class MappedSnapshot:
+    """
+    Знімок (версії 2+, без стиснення), відображений у пам'ять.
+
+    Відкриття читає лише заголовок і кінець файлу; записи декодуються
+    поодинці через decode(). ValueError — файл без індексу (старша версія,
+    стиснення, інший формат) або індекс пошкоджено.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except (ValueError, struct.error):
+            self._mm.close()
+            raise ValueError("Snapshot has no usable index")
+
+    def _open(self) -> None:
+        mm = self._mm
+        magic, self.version, compression = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or self.version not in _DECODERS or self.version < 2 or compression != COMPRESSION["none"]:
+            raise ValueError("Snapshot has no index")
+        index_offset, crc, index_magic = FOOTER.unpack_from(mm, len(mm) - FOOTER.size)
+        if index_magic != INDEX_MAGIC or not HEADER.size <= index_offset <= len(mm) - FOOTER.size:
+            raise ValueError("Snapshot has no index")
+        if zlib.crc32(memoryview(mm)[index_offset:len(mm) - FOOTER.size]) != crc:
+            raise ValueError("Snapshot index checksum mismatch")
+        self.contacts = _KeyIndex(mm, index_offset)
+        self.notes = _KeyIndex(mm, self.contacts.end)
+        self._decoders = _DECODERS[self.version]
+        self._migrations = [_MIGRATIONS[v] for v in range(self.version, SCHEMA_VERSION)]
+
+    def decode(self, offset: int, kind: int) -> Any:
+        """Record або Note з кадру за зсувом offset."""
+        found, length = FRAME.unpack_from(self._mm, offset)
+        if found != kind:
+            raise ValueError("Snapshot index is corrupt")
+        start = offset + FRAME.size
+        view = memoryview(self._mm)[start:start + length]
+        try:
+            which = 0 if kind == KIND_CONTACT else 1
+            raw = self._decoders[which](view)
+        finally:
+            view.release()
+        for migration in self._migrations:
+            raw = migration[which](raw)
+        return build_contact(raw) if kind == KIND_CONTACT else build_note(raw)
+
+
+def _contact_key(rec: Record) -> str:
+    return rec.name.value.lower()
+
+
+def _note_key(note: Note) -> str:
+    return note.title.strip().lower()
+
+
+class MappedRecords(MutableMapping):
+    """
+    Словник книги (book.data) поверх MappedSnapshot: запис декодується при
+    першому зверненні за ключем і кешується.
+
+    Зміни (з журналу, що доповнює знімок) тримаються поверх файлу: нові та
+    змінені записи — у кеші, видалені — у _deleted. Перебір ключів та
+    перевірка «in» записи не декодують.
+    """
+
+    def __init__(self, snapshot: MappedSnapshot, kind: int, owner: Any) -> None:
+        self._snapshot = snapshot
+        self._index = snapshot.contacts if kind == KIND_CONTACT else snapshot.notes
+        self._kind = kind
+        self._key_of = _contact_key if kind == KIND_CONTACT else _note_key
+        self._owner = owner
+        self._cache: Dict[str, Any] = {}
+        self._deleted: Set[str] = set()  # ключі з файлу, видалені поверх нього
+        self._added: Set[str] = set()  # ключі, яких у файлі немає
+
+    def __getitem__(self, key: str) -> Any:
+        obj = self._cache.get(key)
+        if obj is not None:
+            return obj
+        offset = self._index.find(key) if key not in self._deleted else None
+        if offset is None:
+            raise KeyError(key)
+        obj = self._snapshot.decode(offset, self._kind)
+        if self._key_of(obj) != key:
+            raise ValueError("Snapshot index is corrupt")
+        obj._owner = self._owner
+        self._cache[key] = obj
+        return obj
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        return key in self._cache or (key not in self._deleted and self._index.find(key) is not None)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._deleted:
+            self._deleted.discard(key)
+        elif key not in self._cache and self._index.find(key) is None:
+            self._added.add(key)
+        self._cache[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._cache.pop(key, None)
+        if key in self._added:
+            self._added.discard(key)
+        else:
+            self._deleted.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        deleted = self._deleted
+        if not deleted:
+            yield from self._index.keys()
+        else:
+            for key in self._index.keys():
+                if key not in deleted:
+                    yield key
+        yield from list(self._added)
+
+    def __len__(self) -> int:
+        return self._index.count - len(self._deleted) + len(self._added)
+
+    @property
+    def materialized(self) -> int:
+        """Скільки записів уже декодовано."""
+        return len(self._cache)
+
+
+def map_books(path: Union[str, Path]) -> Tuple[AddressBook, NoteBook]:
+    """
+    Книги поверх знімка, відображеного в пам'ять (MappedSnapshot): відкриття
+    не залежить від розміру файлу. ValueError/OSError — знімок без індексу.
+    """
+    snapshot = MappedSnapshot(path)
+    contacts, notes = AddressBook(), NoteBook()
+    contacts.data = MappedRecords(snapshot, KIND_CONTACT, contacts)
+    notes.data = MappedRecords(snapshot, KIND_NOTE, notes)
+    return contacts, notes
@@ -0,0 +1,125 @@
+"""
+Облік змін контактів та нотаток
+
+Кожна книга (AddressBook, NoteBook) має свій ChangeTracker, який знає:
+- які ключі створено, змінено чи видалено з моменту останнього запису
+  на диск (pending — їх забирає бекенд через pop_changes());
+- версію кожного запису — лічильник, що зростає з кожною зміною
+  (кеш може запам'ятати версію і перевірити, чи запис не змінився);
+- стрічку останніх змін з наскрізним номером seq: споживач (індекс, кеш,
+  інкрементальний запис) запам'ятовує seq і потім забирає лише нові зміни
+  через changes_since(), а не переглядає всю книгу.
+
+Версії та стрічка живуть лише в пам'яті поточного процесу; зміни інших
+процесів, прочитані з журналу чи нового знімка, теж потрапляють у стрічку,
+але не в pending. Якщо ж відомо лише те, що дані змінено ззовні, а не які
+саме записи (SQLite-бекенд бачить тільки PRAGMA data_version), invalidate()
+обриває стрічку (changes_since() поверне None) і підвищує версії всіх записів.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+from config import CHANGE_FEED_SIZE
+
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+
+class Change(NamedTuple):
+    """Одна зміна у стрічці."""
+
+    seq: int  # наскрізний номер зміни в книзі
+    key: str  # ключ запису (ім'я/назва в нижньому регістрі)
+    kind: str  # CREATED, MODIFIED або DELETED
+    version: int  # версія запису після зміни
+
+
+def merge_kinds(previous: Optional[str], kind: str) -> str:
+    """
+    Вид незаписаної зміни після ще однієї зміни того самого ключа:
+    створено + змінено → створено; видалено + створено → змінено
+    (на диску запис уже був); будь-що + видалено → видалено.
+    """
+    if previous is None or kind == DELETED:
+        return kind
+    if previous == DELETED:
+        return MODIFIED if kind == CREATED else kind
+    if previous == CREATED:
+        return CREATED
+    return kind
+
+
+class ChangeTracker:
+    """Незаписані зміни, версії записів та стрічка змін однієї книги."""
+
+    __slots__ = ("pending", "seq", "_versions", "_feed", "_base")
+
+    def __init__(self, feed_size: int = CHANGE_FEED_SIZE) -> None:
+        # ключ → вид зміни з моменту останнього запису на диск
+        self.pending: Dict[str, str] = {}
+        # номер останньої зміни (0 — змін ще не було)
+        self.seq = 0
+        self._versions: Dict[str, int] = {}
+        self._feed: Deque[Change] = deque(maxlen=feed_size)
+        # Додається до версій усіх записів; зростає з кожним invalidate()
+        self._base = 0
+
+    def record(self, key: str, kind: str, pending: bool = True) -> Change:
+        """
+        Зареєструвати зміну запису. pending=False — зміна вже є на диску
+        (прочитана з журналу чи бази), записувати її не треба.
+        """
+        count = self._versions.get(key, 0) + 1
+        self._versions[key] = count
+        self.seq += 1
+        change = Change(self.seq, key, kind, count + self._base)
+        self._feed.append(change)
+        if pending:
+            self.pending[key] = merge_kinds(self.pending.get(key), kind)
+        return change
+
+    def pop(self) -> Dict[str, str]:
+        """Забрати незаписані зміни (ключ → вид) та почати накопичення заново."""
+        pending, self.pending = self.pending, {}
+        return pending
+
+    def restore(self, changes: Dict[str, str]) -> None:
+        """
+        Повернути забрані через pop() зміни, які не вдалося записати на диск
+        (новіші зміни тих самих ключів, якщо вони є, — поверх повернутих).
+        """
+        for key, kind in changes.items():
+            newer = self.pending.get(key)
+            self.pending[key] = kind if newer is None else merge_kinds(kind, newer)
+
+    def version(self, key: str) -> int:
+        """Версія запису (0 — дані в цьому процесі ще не змінювались)."""
+        return self._versions.get(key, 0) + self._base
+
+    def invalidate(self) -> None:
+        """
+        Дані змінено ззовні, але невідомо, які записи: споживачі стрічки мають
+        перебудуватися (since() для будь-якого попереднього seq — None), а
+        кеші за версіями — застаріти (версії всіх записів зростають).
+        """
+        self.seq += 1
+        self._feed.clear()
+        self._base += 1
+
+    def since(self, seq: int) -> Optional[List[Change]]:
+        """
+        Зміни з номером більшим за seq, від найстарішої.
+
+        None — частина цих змін уже витіснена зі стрічки (споживач відстав
+        більше ніж на CHANGE_FEED_SIZE змін) і має перебудувати свій стан повністю.
+        """
+        if seq >= self.seq:
+            return []
+        if not self._feed or self._feed[0].seq > seq + 1:
+            return None
+        return list(islice(self._feed, seq + 1 - self._feed[0].seq, None))
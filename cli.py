@@ -1,97 +1,29 @@
 """
 Інтерфейс командного рядка та парсер команд
+
+Два режими:
+- run_cli() — інтерактивний цикл з автодоповненням (prompt_toolkit);
+- run_batch() — пакетне виконання команд з файлу чи stdin без prompt_toolkit,
+  з одним записом змін у кінці (або кожні N команд).
 """
 
 from __future__ import annotations
 
-from typing import List, Tuple
-import shlex
-
-from config import APP_NAME, APP_VERSION
-from commands import REG
-from storage import STORAGE_FILE, load_storage
+from typing import IO, Any, Iterable, Iterator, List, Optional
+import shutil
+import signal
+import sys
+import time
+
+from config import APP_NAME, APP_VERSION, PAGER_ENABLED
+from commands import REG, Output
+from parsing import parse_input
+from storage import (
+    AutosaveError, background_saves, deferred_saves, flush_changes, get_backend, open_storage, storage_read_lock,
+    Storage,
+)
 # додано імпорт кольорових помічників, бейджів та іконок
-from color_helper import ICON_BOT, BADGE_ERROR, BADGE_ASSISTANT, colored_error
-
-# ----prompt_toolkit для автокомпліту команд ----
-from prompt_toolkit.completion import Completer, Completion
-from prompt_toolkit import PromptSession
-
-
-class HintsCompleter(Completer):
-    def __init__(self, hints, get_contacts_func=None):
-        self.hints = tuple(sorted(set(hints)))
-        self.get_contacts_func = get_contacts_func  # optional callback
-
-    def get_completions(self, document, complete_event):
-        tb = document.text_before_cursor
-        word = document.get_word_before_cursor()
-        tokens = tb.split()
-        ends_with_space = tb.endswith(" ")
-
-        # 1) Підказки для команди (перший токен)
-        if not tokens or (len(tokens) == 1 and not ends_with_space):
-            low = word.lower()
-            for hint in self.hints:
-                if hint.startswith(low):
-                    yield Completion(hint, start_position=-len(word))
-            return
-
-        # Який токен зараз редагується? (0-based)
-        # приклади:
-        #   "add|"                -> tokens=['add']            , cur_index=0
-        #   "add Sa|"             -> tokens=['add','Sa']       , cur_index=1
-        #   "add Sasha 050|"      -> tokens=['add','Sasha','050'], cur_index=2
-        cur_index = len(tokens) if ends_with_space else len(tokens) - 1
-
-        command = tokens[0].lower()
-        # 1a) Підказки для команди "help" (другий аргумент - ім'я команди)
-        if command == "help" and cur_index == 1:
-            low = word.lower()
-            for hint in self.hints:          # self.hints = список усіх команд
-                if hint.startswith(low):
-                    yield Completion(hint, start_position=-len(word))
-            return
-        # 2) Підказки імен тільки для ДРУГОГО аргументу (cur_index == 1)
-        if cur_index == 1 and command in (
-            "add-contact", "change-phone", "show-phone", "add-birthday",
-            "show-birthday", "add-email", "delete-email", "add-address",
-            "delete-contact", "delete-phone", "delete-address", "find-contact"
-        ):
-            if self.get_contacts_func:
-                low = word.lower()
-                for name in self.get_contacts_func():
-                    if name.lower().startswith(low):
-                        yield Completion(name, start_position=-len(word))
-
-
-def parse_input(line: str) -> Tuple[str, List[str]]:
-    """
-    Розбити команду на ім'я та аргументи, підтримуючи лапки.
-
-    Приклади:
-        'add "John Doe" 1234567890'
-        → cmd='add', args=['John Doe', '1234567890']
-
-        'add-note "My Note" Some text here'
-        → cmd='add-note', args=['My Note', 'Some', 'text', 'here']
-
-    shlex.split() вміє парсити лапки як у shell:
-    - "текст з пробілами" → один аргумент
-    - текст без лапок → розбивається за пробілами
-    """
-    try:
-        # shlex.split() обробляє лапки як в Unix shell
-        parts = shlex.split(line, posix=True)
-    except ValueError:
-        # Якщо лапки неправильні, просто розбиваємо за пробілами
-        parts = line.split()
-
-    if not parts:
-        return "", []
-    cmd = parts[0].lower()
-    args = parts[1:]
-    return cmd, args
+from color_helper import ICON_BOT, BADGE_ERROR, BADGE_ASSISTANT, colored_error, init_colors
 
 
 def get_all_commands() -> List[str]:
@@ -99,103 +31,183 @@ def get_all_commands() -> List[str]:
     return list(REG.all_commands())
 
 
-# отримання імен контактів зі сховища динамічно
-def get_contact_names(storage):
+def execute_line(line: str, storage: Storage) -> Optional[Output]:
     """
-    Return a list of contact display names from storage.contacts (AddressBook).
-    Handles both API-based (.all())
-    and dict-backed (.data / ._data) implementations.
+    Виконати один рядок команди та повернути відповідь.
+
+    None — порожній рядок; "__EXIT__" — команда виходу; відповідь може бути
+    ітератором рядків (великі списки), див. print_output().
     """
-    names = []
+    cmd_name, args = parse_input(line)
+    if not cmd_name:
+        return None
+    return execute_command(cmd_name, args, storage)
+
+
+def execute_command(cmd_name: str, args: List[str], storage: Storage) -> Output:
+    """Виконати вже розібрану команду (результат parse_input(), напр. від клієнта демона)."""
+    resolved = REG.resolve(cmd_name)
+
+    if not resolved:
+        # Додано помилку-бейдж та червоний колір для невідомих команд
+        similar = REG.suggest(cmd_name)
+        if similar:
+            error_msg = f"Unknown command. Did you mean: {', '.join(similar)}? Type 'help'."
+        else:
+            error_msg = "Unknown command. Type 'help'."
+        return f"{BADGE_ERROR} {colored_error(error_msg)}"
 
     try:
-        ab = storage.contacts  # AddressBook
-    except AttributeError:
-        return []
+        REG.validate_args(resolved, args)
+        handler = REG.handler(resolved)
+        return handler(args, storage)
+    except IndexError as e:
+        # Додано помилку-бейдж та червоний колір для помилок індексу
+        return f"{BADGE_ERROR} {colored_error(str(e))}"
+
+
+def print_output(out: Output, pager: bool = False) -> None:
+    """
+    Вивести відповідь: з бейджем асистента, якщо це не помилка.
 
-    # Case 1: AddressBook has .all() returning Record objects
+    Ітератор рядків виводиться потоково — перший рядок з'являється одразу,
+    не чекаючи, поки відформатується весь список. З pager=True вивід
+    зупиняється після кожного екрана (рядки наступних сторінок не форматуються,
+    якщо користувач вийшов).
+    """
+    page_height = shutil.get_terminal_size().lines - 1 if pager and not isinstance(out, str) else 0
+    shown = 0
+    for line in format_output(out):
+        print(line)
+        shown += line.count("\n") + 1
+        if page_height > 0 and shown >= page_height:
+            if not _more():
+                break
+            shown = 0
+
+
+def format_output(out: Output) -> Iterator[str]:
+    """Рядки відповіді так, як їх виводить print_output(): бейдж асистента перед першим (крім помилок)."""
+    if isinstance(out, str):
+        yield out if out.startswith(BADGE_ERROR) else f"{BADGE_ASSISTANT} {out}"
+        return
+    for i, line in enumerate(out):
+        yield f"{BADGE_ASSISTANT} {line}" if i == 0 else line
+
+
+def _more() -> bool:
+    """Запитати, чи показувати наступну сторінку (Enter — так, q — ні)."""
     try:
-        for rec in ab.all():
-            n = getattr(rec, "name", None)
-            n = getattr(n, "value", n)
-            if n:
-                names.append(str(n))
-    except Exception:
-        pass
-
-    # Case 2: dict-like .data / ._data with Record values
-    for attr in ("data", "_data"):
-        d = getattr(ab, attr, None)
-        if isinstance(d, dict):
-            for rec in d.values():
-                n = getattr(rec, "name", None)
-                n = getattr(n, "value", n)
-                if n:
-                    names.append(str(n))
-
-    # Видалення дублікатів та повернення
-    seen, uniq = set(), []
-    for n in names:
-        if n and n not in seen:
-            uniq.append(n)
-            seen.add(n)
-
-    return uniq
-
-
-def run_cli() -> None:
-    storage = load_storage()
+        answer = input("-- More -- (Enter: next page, q: quit) ")
+    except (EOFError, KeyboardInterrupt):
+        print()
+        return False
+    return answer.strip().lower() != "q"
+
+
+def run_cli(read_only: bool = False) -> int:
+    # prompt_toolkit потрібен лише в інтерактивному режимі
+    from prompt_toolkit import PromptSession
+    from completion import HintsCompleter, get_arg_completions
+
+    init_colors()
+    # Дані читаються з диска при першій команді, яка їх потребує
+    storage = open_storage(read_only)
     # Додано іконку бота після APP_NAME
     print(f"{APP_NAME} {ICON_BOT} v{APP_VERSION}. Type 'help' for commands.")
-    print(f"Data stored in: {STORAGE_FILE}\n")
+    print(f"Data stored in: {get_backend().path}{' (read-only)' if read_only else ''}\n")
 
     session = PromptSession()
 
-    # Debug
-    # print("DEBUG contact names:", get_contact_names(storage))
-
     completer = HintsCompleter(
         hints=get_all_commands(),
-        get_contacts_func=lambda: get_contact_names(storage)
+        complete_arg_func=lambda command, index, prefix, args: get_arg_completions(
+            storage, command, index, prefix, args
+        ),
     )
 
-    while True:
-        try:
-            line = session.prompt(
-                "enter the command > ",
-                completer=completer,
-                complete_while_typing=True
-            ).strip()
-        except (EOFError, KeyboardInterrupt):
-            print()
-            break
-
-        if not line:
-            continue
-
-        cmd_name, args = parse_input(line)
-        resolved = REG.resolve(cmd_name)
-
-        if not resolved:
-            # Додано помилку-бейдж та червоний колір для невідомих команд
-            error_msg = "Unknown command. Type 'help'."
-            print(f"{BADGE_ERROR} {colored_error(error_msg)}")
-            continue
-
-        try:
-            REG.validate_args(resolved, args)
-            handler = REG.handler(resolved)
-            out = handler(args, storage)
-        except IndexError as e:
-            # Додано помилку-бейдж та червоний колір для помилок індексу
-            out = f"{BADGE_ERROR} {colored_error(str(e))}"
-        if out == "__EXIT__":
-            break
-        # Виведення з бейджем асистента, якщо це не помилка
-        if not out.startswith(f"{BADGE_ERROR}"):
-            print(f"{BADGE_ASSISTANT} {out}")
-        else:
-            print(out)
+    _exit_on_signals()
+    # Зміни записує фоновий потік; при виході з блоку незаписане зберігається
+    try:
+        with background_saves(storage):
+            while True:
+                try:
+                    line = session.prompt(
+                        "enter the command > ",
+                        completer=completer,
+                        complete_while_typing=True
+                    ).strip()
+                except (EOFError, KeyboardInterrupt):
+                    print()
+                    break
+
+                # Фоновий запис може підтягувати чужі зміни в ті самі книги; відповідь
+                # може бути ітератором по них, тож виведення — теж під блокуванням
+                with storage_read_lock():
+                    out = execute_line(line, storage)
+                    if out is None:
+                        continue
+                    if out == "__EXIT__":
+                        break
+                    # Виведення з бейджем асистента, якщо це не помилка
+                    print_output(out, pager=PAGER_ENABLED and sys.stdout.isatty())
+    except AutosaveError as e:
+        # Останній запис при виході не вдався — користувач має про це знати
+        print(f"{BADGE_ERROR} {colored_error(str(e))}", file=sys.stderr)
+        return 1
 
     # ЗМІНЕНО: Додано іконку
     print("👋 Bye!")
+    return 0
+
+
+def _exit_on_signals() -> None:
+    """SIGTERM/SIGHUP завершують програму через SystemExit — так спрацьовує запис незбережених змін."""
+
+    def handler(signum: int, frame: Any) -> None:
+        raise SystemExit(128 + signum)
+
+    for name in ("SIGTERM", "SIGHUP"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), handler)
+
+
+def run_batch(lines: Iterable[str], commit_every: int = 0, quiet: bool = False,
+              report: IO[str] = sys.stderr, read_only: bool = False) -> int:
+    """
+    Пакетно виконати команди (по одній на рядок) без інтерактивного інтерфейсу.
+
+    Рядки читаються потоково; порожні та ті, що починаються з '#', пропускаються.
+    Зміни від @mutating-команд накопичуються і записуються одним записом у кінці
+    (або кожні commit_every команд, якщо > 0). Наприкінці у report виводиться
+    кількість команд, помилок та швидкість. Повертає кількість помилок.
+    read_only=True — сховище лише для читання: команди, що змінюють дані, — помилки.
+    """
+    init_colors()
+    storage = open_storage(read_only)
+    done = errors = 0
+    started = time.perf_counter()
+    with deferred_saves(storage):
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            out = execute_line(line, storage)
+            if out is None:
+                continue
+            if out == "__EXIT__":
+                break
+            done += 1
+            if isinstance(out, str) and out.startswith(BADGE_ERROR):
+                errors += 1
+            if not quiet:
+                print_output(out)
+            if commit_every > 0 and done % commit_every == 0:
+                flush_changes(storage)
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"Batch: {done} commands ({errors} errors) in {elapsed:.2f} s — {rate:.0f} cmd/s",
+        file=report,
+    )
+    return errors
@@ -12,10 +12,22 @@ Color helper module для colorama текстового стилю, бейдж
 - іконки для бота, телефонної книги, нотаток та виходу
 """
 
-from colorama import Fore, Back, Style, init
+from colorama import Fore, Back, Style
+
+# Ініціалізація colorama (обгортка stdout) робиться не при імпорті,
+# а функцією init_colors() на старті інтерактивного чи пакетного режиму
+_initialized = False
+
+
+def init_colors() -> None:
+    """Ініціалізувати colorama (один раз)."""
+    global _initialized
+    if not _initialized:
+        from colorama import init
+
+        init(autoreset=True)
+        _initialized = True
 
-# Ініціалізація colorama
-init(autoreset=True)
 
 # ===== Color Constants =====
 # червоний колір для помилок
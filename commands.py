@@ -4,11 +4,21 @@
 
 from __future__ import annotations
 
-from typing import Callable, Dict, List, Optional
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import functools
-
-from models import Address, Birthday, Email, Name, Note, Phone, Record
-from storage import Storage, save_storage
+import time
+
+from config import (
+    BIRTHDAY_FORMAT,
+    BIRTHDAY_STATS_DAYS_DEFAULT,
+    FUZZY_MAX_DISTANCE_COMMANDS,
+    FUZZY_MAX_SUGGESTIONS,
+    UPCOMING_DAYS_DEFAULT,
+)
+from indexes import FuzzyIndex
+from models import Address, Birthday, Email, Name, Note, NotFoundError, Phone, Record
+from storage import Storage, persist_changes, refresh_storage, storage_lock
 # додано імпорт кольорових помічників
 from color_helper import (
     colored_error, colored_title, colored_tag, BADGE_ERROR,
@@ -16,10 +26,13 @@ from color_helper import (
     colored_info, colored_warning
 )
 
-from datetime import date
+from datetime import date, datetime, timedelta
+
+# Відповідь команди: рядок або ітератор рядків (великі списки виводяться потоково)
+Output = Union[str, Iterator[str]]
 
-# Тип обробника команди: функція приймає аргументи та сховище, повертає рядок
-Handler = Callable[[List[str], Storage], str]
+# Тип обробника команди: функція приймає аргументи та сховище, повертає відповідь
+Handler = Callable[[List[str], Storage], Output]
 
 
 class CommandRegistry:
@@ -30,20 +43,30 @@ class CommandRegistry:
         self._help: Dict[str, str] = {}
         self._sections: Dict[str, str] = {}
         self._min_args: Dict[str, int] = {}
+        self._complete: Dict[str, Tuple[str, ...]] = {}
+        self._fuzzy: Optional[FuzzyIndex] = None  # будується при першій підказці
 
     def register(
         self, name: str, *, help: str = "", section: str | None = None,
-        min_args: int = 0
+        min_args: int = 0, complete: Tuple[str, ...] = ()
     ) -> Callable[[Handler], Handler]:
-        """Зареєструвати команду."""
+        """
+        Зареєструвати команду.
+
+        complete — тип автодоповнення для кожного аргументу за позицією
+        (ARG_CONTACT, ARG_PHONE, ARG_NOTE, ...); ARG_TAGS в кінці означає,
+        що всі наступні аргументи — теги.
+        """
 
         def decorator(func: Handler) -> Handler:
             key = name.strip().lower()
             if key in self._handlers:
                 raise RuntimeError(f"Duplicate command: {name}")
             self._handlers[key] = func
+            self._fuzzy = None
             self._help[key] = help.strip()
             self._min_args[key] = min_args
+            self._complete[key] = tuple(complete)
             normalized_section = section.strip() if section else DEFAULT_SECTION
             if normalized_section not in SECTION_ORDER[:-1]:
                 normalized_section = DEFAULT_SECTION
@@ -57,6 +80,23 @@ class CommandRegistry:
         k = name.strip().lower()
         return k if k in self._handlers else None
 
+    def suggest(self, name: str, limit: int = FUZZY_MAX_SUGGESTIONS) -> List[str]:
+        """Схожі імена команд для невідомої команди («Did you mean ...»)."""
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(FUZZY_MAX_DISTANCE_COMMANDS)
+            for key in self._handlers:
+                self._fuzzy.add(key)
+        return self._fuzzy.lookup(name.strip().lower(), limit)
+
+    def arg_kind(self, name: str, index: int) -> Optional[str]:
+        """Тип автодоповнення для аргументу з номером index (0 — перший аргумент)."""
+        kinds = self._complete.get(name.strip().lower(), ())
+        if index < len(kinds):
+            return kinds[index]
+        if kinds and kinds[-1] == ARG_TAGS:
+            return ARG_TAGS
+        return None
+
     def handler(self, key: str) -> Handler:
         """Отримати обробник за ключем."""
         return self._handlers[key]
@@ -127,9 +167,97 @@ SECTION_SYSTEM = "System"
 SECTION_ORDER = [SECTION_PHONEBOOK, SECTION_NOTES, SECTION_SYSTEM, "Other"]
 DEFAULT_SECTION = SECTION_ORDER[-1]
 
+# Типи автодоповнення аргументів (див. CommandRegistry.register(complete=...))
+ARG_COMMAND = "command"      # ім'я команди
+ARG_CONTACT = "contact"      # ім'я контакта
+ARG_PHONE = "phone"          # телефон контакта з першого аргументу
+ARG_EMAIL = "email"          # email контакта з першого аргументу
+ARG_NOTE = "note"            # назва нотатки
+ARG_NOTE_TAG = "note-tag"    # тег нотатки з першого аргументу
+ARG_TAGS = "tags"            # будь-який тег (цей і всі наступні аргументи)
+
 
 REG = CommandRegistry()
 
+# Роздільник між нотатками у списках
+NOTE_SEPARATOR = "-" * 40
+
+
+def parse_paging(args: List[str]) -> Tuple[List[str], int, Optional[int]]:
+    """
+    Вилучити з аргументів --limit N та --offset N.
+
+    Повертає (решта аргументів, offset, limit); limit None — без обмеження.
+    """
+    rest: List[str] = []
+    values = {"--offset": 0, "--limit": None}
+    it = iter(args)
+    for arg in it:
+        if arg.lower() in values:
+            raw = next(it, "")
+            if not raw.isdigit():
+                raise ValueError(f"{arg.lower()} must be a non-negative whole number.")
+            values[arg.lower()] = int(raw)
+        else:
+            rest.append(arg)
+    return rest, values["--offset"] or 0, values["--limit"]
+
+
+def paged(lines: Iterable[str], offset: int, limit: Optional[int], total: int) -> Iterator[str]:
+    """
+    Передати рядки сторінки далі та, якщо задано --limit/--offset,
+    додати «Shown a–b of N» (total — кількість записів без обмеження).
+    """
+    yield from lines
+    if limit is not None or offset:
+        shown = max(0, min(total - offset, total if limit is None else limit))
+        if shown:
+            yield colored_info(f"Shown {offset + 1}–{offset + shown} of {total}")
+        else:
+            yield colored_info(f"Nothing to show at offset {offset} (total {total})")
+
+
+def _format_contact(r: Record) -> str:
+    """Контакт одним рядком з кольоровими назвами полів."""
+    # Додано кольори до ключів у виводі контактів (Name, Phones, Emails, Address, Birthday)
+    parts = []
+    parts.append(f"{colored_tag('Name:')} {r.name.value}")
+    if r.phones:
+        phone_values = ", ".join(p.value for p in r.phones)
+        parts.append(f"{colored_tag('Phones:')} {phone_values}")
+    if r.emails:
+        email_values = ", ".join(e.value for e in r.emails)
+        parts.append(f"{colored_tag('Emails:')} {email_values}")
+    if r.address:
+        parts.append(f"{colored_tag('Address:')} {str(r.address)}")
+    if r.birthday:
+        parts.append(f"{colored_tag('Birthday:')} {r.birthday.value}")
+    return " | ".join(parts)
+
+
+def _format_note(n: Note, with_created: bool = False) -> str:
+    """Нотатка: заголовок з тегами (і датою створення) та текст."""
+    # Додано фіолетовий колір до тегів
+    if n.tags:
+        sorted_tags = sorted(n.tags)
+        formatted_tags = " #".join(sorted_tags)
+        tgs = colored_tag(f"#{formatted_tags}")
+    else:
+        tgs = "(no tags)"
+    if with_created:
+        return f"{n.title} [{tgs}] — {n.created:%Y-%m-%d %H:%M}\n{n.text}"
+    return f"{n.title} [{tgs}]\n{n.text}"
+
+
+def _note_blocks(notes: Iterable[Note], with_created: bool = False) -> Iterator[str]:
+    """Нотатки, розділені лініями (форматуються по одній під час виводу)."""
+    yield ""
+    yield NOTE_SEPARATOR
+    for n in notes:
+        yield _format_note(n, with_created)
+        yield NOTE_SEPARATOR
+    yield ""
+
 
 def input_error(func: Handler) -> Handler:
     """
@@ -153,13 +281,17 @@ def input_error(func: Handler) -> Handler:
     """
 
     @functools.wraps(func)
-    def inner(args: List[str], storage: Storage) -> str:
+    def inner(args: List[str], storage: Storage) -> Output:
         try:
             return func(args, storage)
         except KeyError as e:
             # Додано помилку-бейдж та червоний колір для не знайдених ключів
             err_key = e.args[0] if e.args else '?'
             error_text = f"Not found: '{err_key}'."
+            if isinstance(e, NotFoundError):
+                similar = e.suggestions()
+                if similar:
+                    error_text += f" Did you mean: {', '.join(similar)}?"
             return f"{BADGE_ERROR} {colored_error(error_text)}"
         except ValueError as e:
             # Додано помилку-бейдж та червоний колір для помилок значень
@@ -181,10 +313,14 @@ def mutating(func: Handler) -> Handler:
     """
     Декоратор для команд, які змінюють дані (автоматичне збереження).
 
-    Автоматично викликає save_storage() після успішного виконання команди.
+    Автоматично викликає persist_changes() після успішного виконання команди:
+    у журнал дописуються лише змінені контакти/нотатки.
+    Команда виконується під блокуванням сховища і над свіжими даними:
+    перед нею підтягуються зміни, записані іншими процесами.
     НЕ зберігає якщо:
     - функція повернула помилку (починається з "Error")
     - функція повернула сигнал виходу ("__EXIT__")
+    Сховище лише для читання (--read-only) — команда не виконується (PermissionError).
 
     Приклад:
         @mutating
@@ -192,7 +328,7 @@ def mutating(func: Handler) -> Handler:
             rec = Record(Name(args[0]))
             storage.contacts.add_record(rec)
             return "Contact added"
-            # Автоматично викличе save_storage(storage)
+            # Автоматично викличе persist_changes(storage)
 
         @mutating
         def cmd_invalid(args, storage):
@@ -201,10 +337,14 @@ def mutating(func: Handler) -> Handler:
     """
 
     @functools.wraps(func)
-    def inner(args: List[str], storage: Storage) -> str:
-        result = func(args, storage)
-        if result and not result.startswith("Error") and result != "__EXIT__":
-            save_storage(storage)
+    def inner(args: List[str], storage: Storage) -> Output:
+        if getattr(storage, "read_only", False):
+            raise PermissionError("storage is opened read-only (--read-only)")
+        with storage_lock():
+            refresh_storage(storage)
+            result = func(args, storage)
+            if result and not (isinstance(result, str) and (result.startswith("Error") or result == "__EXIT__")):
+                persist_changes(storage)
         return result
 
     return inner
@@ -220,6 +360,7 @@ def mutating(func: Handler) -> Handler:
     help='Usage: add-contact "Name" [0123456789]',
     section=SECTION_PHONEBOOK,
     min_args=1,
+    complete=(ARG_CONTACT,),
 )
 @input_error
 @mutating
@@ -254,6 +395,7 @@ def cmd_add(args: List[str], storage: Storage) -> str:
     help='Usage: change-phone "Name" old10 new10',
     section=SECTION_PHONEBOOK,
     min_args=3,
+    complete=(ARG_CONTACT, ARG_PHONE),
 )
 @input_error
 @mutating
@@ -269,6 +411,7 @@ def cmd_change(args: List[str], storage: Storage) -> str:
     help='Usage: show-phone "Name"',
     section=SECTION_PHONEBOOK,
     min_args=1,
+    complete=(ARG_CONTACT,),
 )
 @input_error
 def cmd_phone(args: List[str], storage: Storage) -> str:
@@ -282,31 +425,18 @@ def cmd_phone(args: List[str], storage: Storage) -> str:
 
 @REG.register(
     "all-contacts",
-    help="Show all contacts",
+    help="Usage: all-contacts [--limit N] [--offset N]",
     section=SECTION_PHONEBOOK
 )
 @input_error
-def cmd_all(args: List[str], storage: Storage) -> str:  # noqa: ARG001
-    items = storage.contacts.all()
-    if not items:
+def cmd_all(args: List[str], storage: Storage) -> Output:
+    _, offset, limit = parse_paging(args)
+    total = len(storage.contacts)
+    if not total:
         return "No contacts."
-    # Додано кольори до ключів у виводі контактів (Name, Phones, Emails, Address, Birthday)
-    colored_items = []
-    for r in items:
-        parts = []
-        parts.append(f"{colored_tag('Name:')} {r.name.value}")
-        if r.phones:
-            phone_values = ", ".join(p.value for p in r.phones)
-            parts.append(f"{colored_tag('Phones:')} {phone_values}")
-        if r.emails:
-            email_values = ", ".join(e.value for e in r.emails)
-            parts.append(f"{colored_tag('Emails:')} {email_values}")
-        if r.address:
-            parts.append(f"{colored_tag('Address:')} {str(r.address)}")
-        if r.birthday:
-            parts.append(f"{colored_tag('Birthday:')} {r.birthday.value}")
-        colored_items.append(" | ".join(parts))
-    return "\n".join(colored_items)
+    # Сторінка береться з впорядкованого індексу, рядки форматуються під час виводу
+    page = storage.contacts.page(offset, limit)
+    return paged((_format_contact(r) for r in page), offset, limit, total)
 
 
 @REG.register(
@@ -314,6 +444,7 @@ def cmd_all(args: List[str], storage: Storage) -> str:  # noqa: ARG001
     help='Usage: add-birthday "Name" DD.MM.YYYY',
     section=SECTION_PHONEBOOK,
     min_args=2,
+    complete=(ARG_CONTACT,),
 )
 @input_error
 @mutating
@@ -328,6 +459,7 @@ def cmd_add_birthday(args: List[str], storage: Storage) -> str:
     help='Usage: show-birthday "Name"',
     section=SECTION_PHONEBOOK,
     min_args=1,
+    complete=(ARG_CONTACT,),
 )
 @input_error
 def cmd_show_birthday(args: List[str], storage: Storage) -> str:
@@ -340,23 +472,26 @@ def cmd_show_birthday(args: List[str], storage: Storage) -> str:
 
 @REG.register(
     "birthdays",
-    help="Show upcoming birthdays (within 7 days)",
+    help=f"Usage: birthdays [days] — upcoming birthdays (default {UPCOMING_DAYS_DEFAULT} days)",
     section=SECTION_PHONEBOOK,
 )
 @input_error
-def cmd_birthdays(args: List[str], storage: Storage) -> str:  # noqa: ARG001
-    days = 7
-    bucket = storage.contacts.upcoming_birthdays(days)
+def cmd_birthdays(args: List[str], storage: Storage) -> str:
+    try:
+        days = int(args[0]) if args else UPCOMING_DAYS_DEFAULT
+    except ValueError:
+        raise ValueError("Days must be a whole number.")
+    if days < 0:
+        raise ValueError("Days must not be negative.")
+    today = date.today()
+    bucket = storage.contacts.upcoming_birthdays(days, today)
     if not bucket:
         return "No upcoming birthdays."
 
-    today = date.today()
     lines = []
     for delta, items in bucket.items():
+        date_str = (today + timedelta(days=delta)).strftime("%d.%m.%Y")
         for name, bday, wk in items:
-            record = storage.contacts.get_record(name)
-            next_bd = record.get_next_birthday(today)
-            date_str = next_bd.strftime("%d.%m.%Y")
             if delta == 0:
                 lines.append(f"{ICON_BIRTHDAY} Congrats {name} — today! ({date_str}, {wk})")
             elif delta == 1:
@@ -367,11 +502,44 @@ def cmd_birthdays(args: List[str], storage: Storage) -> str:  # noqa: ARG001
     return "\n".join(lines)
 
 
+@REG.register(
+    "birthday-stats",
+    help=f"Usage: birthday-stats [days] — birthdays per month, ages, next days by weekday "
+         f"(default {BIRTHDAY_STATS_DAYS_DEFAULT} days; needs numpy)",
+    section=SECTION_PHONEBOOK,
+)
+@input_error
+def cmd_birthday_stats(args: List[str], storage: Storage) -> str:
+    # numpy імпортується лише тут (необов'язкова залежність)
+    from analytics import MONTH_NAMES, WEEKDAY_NAMES, birthday_stats
+
+    try:
+        days = int(args[0]) if args else BIRTHDAY_STATS_DAYS_DEFAULT
+    except ValueError:
+        raise ValueError("Days must be a whole number.")
+    if days < 0:
+        raise ValueError("Days must not be negative.")
+    stats = birthday_stats(storage.contacts, date.today(), days)
+    if not stats["total"]:
+        return "No birthdays recorded."
+
+    per_month = ", ".join(f"{m} {c}" for m, c in zip(MONTH_NAMES, stats["per_month"]))
+    ages = ", ".join(f"{d}–{d + 9}: {c}" for d, c in stats["ages"].items())
+    per_weekday = ", ".join(f"{w[:3]} {c}" for w, c in zip(WEEKDAY_NAMES, stats["per_weekday"]))
+    return "\n".join([
+        f"{colored_tag('Contacts with birthday:')} {stats['total']} (born on 29 Feb: {stats['leap_day']})",
+        f"{colored_tag('Per month:')} {per_month}",
+        f"{colored_tag('Ages:')} {ages}",
+        f"{colored_tag(f'Next {days} days:')} {stats['upcoming']} birthdays — {per_weekday}",
+    ])
+
+
 @REG.register(
     "add-email",
     help='Usage: add-email "Name" example@mail.com',
     section=SECTION_PHONEBOOK,
     min_args=2,
+    complete=(ARG_CONTACT,),
 )
 @input_error
 @mutating
@@ -387,6 +555,7 @@ def cmd_add_email(args: List[str], storage: Storage) -> str:
     help='Usage: delete-email "Name" example@mail.com',
     section=SECTION_PHONEBOOK,
     min_args=2,
+    complete=(ARG_CONTACT, ARG_EMAIL),
 )
 @input_error
 @mutating
@@ -403,6 +572,7 @@ def cmd_remove_email(args: List[str], storage: Storage) -> str:
     help='Usage: add-address "Name" "Kyiv, ..."',
     section=SECTION_PHONEBOOK,
     min_args=2,
+    complete=(ARG_CONTACT,),
 )
 @input_error
 @mutating
@@ -422,6 +592,7 @@ def cmd_set_address(args: List[str], storage: Storage) -> str:
     help='Usage: delete-phone "Name" 0123456789',
     section=SECTION_PHONEBOOK,
     min_args=2,
+    complete=(ARG_CONTACT, ARG_PHONE),
 )
 @input_error
 @mutating
@@ -437,6 +608,7 @@ def cmd_remove_phone(args: List[str], storage: Storage) -> str:
     help='Usage: delete-address "Name"',
     section=SECTION_PHONEBOOK,
     min_args=1,
+    complete=(ARG_CONTACT,),
 )
 @input_error
 @mutating
@@ -449,12 +621,20 @@ def cmd_remove_address(args: List[str], storage: Storage) -> str:
 
 
 @REG.register(
-    "find-contact", help="Usage: find-contact query", section=SECTION_PHONEBOOK, min_args=1
+    "find-contact", help="Usage: find-contact query [--limit N] [--offset N]", section=SECTION_PHONEBOOK,
+    min_args=1, complete=(ARG_CONTACT,)
 )
 @input_error
-def cmd_find(args: List[str], storage: Storage) -> str:
+def cmd_find(args: List[str], storage: Storage) -> Output:
+    args, offset, limit = parse_paging(args)
+    if not args:
+        raise IndexError(f"Not enough arguments. {REG.get_help('find-contact')}")
     res = storage.contacts.search(args[0])
-    return "\n".join(str(r) for r in res) if res else "No results."
+    if not res:
+        return "No results."
+    stop = None if limit is None else offset + limit
+    page = res[offset:stop]
+    return paged((str(r) for r in page), offset, limit, len(res))
 
 
 @REG.register(
@@ -462,6 +642,7 @@ def cmd_find(args: List[str], storage: Storage) -> str:
     help='Usage: delete-contact "Name"',
     section=SECTION_PHONEBOOK,
     min_args=1,
+    complete=(ARG_CONTACT,),
 )
 @input_error
 @mutating
@@ -471,6 +652,47 @@ def cmd_delete_contact(args: List[str], storage: Storage) -> str:
     return "Contact not found."
 
 
+@REG.register(
+    "import-contacts",
+    help="Usage: import-contacts FILE [csv|vcf|jsonl]",
+    section=SECTION_PHONEBOOK,
+    min_args=1,
+)
+@input_error
+@mutating
+def cmd_import_contacts(args: List[str], storage: Storage) -> str:
+    from transfer import import_contacts  # csv/json потрібні лише тут
+
+    path = Path(args[0]).expanduser()
+    started = time.perf_counter()
+    result = import_contacts(storage.contacts, path, args[1] if len(args) > 1 else None)
+    elapsed = time.perf_counter() - started
+    rate = result.total / elapsed if elapsed > 0 else float("inf")
+    lines = [
+        f"Imported {result.total} contacts ({result.added} new, {result.merged} merged, "
+        f"{result.error_count} skipped) in {elapsed:.2f} s — {rate:.0f} rec/s"
+    ]
+    lines += [colored_warning(err) for err in result.errors]
+    if result.error_count > len(result.errors):
+        lines.append(colored_warning(f"... and {result.error_count - len(result.errors)} more"))
+    return "\n".join(lines)
+
+
+@REG.register(
+    "export-contacts",
+    help="Usage: export-contacts FILE [csv|vcf|jsonl]",
+    section=SECTION_PHONEBOOK,
+    min_args=1,
+)
+@input_error
+def cmd_export_contacts(args: List[str], storage: Storage) -> str:
+    from transfer import export_contacts
+
+    path = Path(args[0]).expanduser()
+    count = export_contacts(storage.contacts, path, args[1] if len(args) > 1 else None)
+    return f"Exported {count} contacts to {path}"
+
+
 # ==============================
 # Нотатки
 # ==============================
@@ -495,77 +717,98 @@ def cmd_add_note(args: List[str], storage: Storage) -> str:
 
 @REG.register(
     "all-notes",
-    help="List all notes (sort by title or created)",
+    help="Usage: all-notes [title|created] [--limit N] [--offset N]",
     section=SECTION_NOTES,
 )
 @input_error
-def cmd_list_notes(args: List[str], storage: Storage) -> str:
+def cmd_list_notes(args: List[str], storage: Storage) -> Output:
+    args, offset, limit = parse_paging(args)
     sort_by = (args[0] if args else "title").strip().lower()
-    items = storage.notes.all(sort_by=sort_by)
-    if not items:
+    total = len(storage.notes)
+    if not total:
         return "No notes."
-    out = []
-    for n in items:
-        # Додано фіолетовий колір до тегів
-        if n.tags:
-            sorted_tags = sorted(n.tags)
-            formatted_tags = " #".join(sorted_tags)
-            tgs = colored_tag(f"#{formatted_tags}")
-        else:
-            tgs = "(no tags)"
-        out.append(f"{n.title} [{tgs}] — {n.created:%Y-%m-%d %H:%M}\n{n.text}")
-    separator = "\n" + "-" * 40 + "\n"
-    return separator + separator.join(out) + separator
+    page = storage.notes.page(sort_by, offset, limit)
+    return paged(_note_blocks(page, with_created=True), offset, limit, total)
+
+
+@REG.register(
+    "notes-by-date",
+    help="Usage: notes-by-date DD.MM.YYYY [DD.MM.YYYY] [--limit N] [--offset N] — notes created in the date range",
+    section=SECTION_NOTES,
+    min_args=1,
+)
+@input_error
+def cmd_notes_by_date(args: List[str], storage: Storage) -> Output:
+    args, offset, limit = parse_paging(args)
+    if not args:
+        raise IndexError(f"Not enough arguments. {REG.get_help('notes-by-date')}")
+    try:
+        start = datetime.strptime(args[0], BIRTHDAY_FORMAT)
+        end = datetime.strptime(args[1], BIRTHDAY_FORMAT) if len(args) > 1 else datetime.now()
+    except ValueError:
+        raise ValueError(f"Dates must be in {BIRTHDAY_FORMAT} format.")
+    # Кінцева дата включно: до початку наступного дня
+    end = end.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    res = storage.notes.created_between(start, end)
+    if not res:
+        return "No notes in this period."
+    stop = None if limit is None else offset + limit
+    return paged(_note_blocks(res[offset:stop], with_created=True), offset, limit, len(res))
 
 
 @REG.register(
     "find-note",
-    help="Usage: find-note query",
+    help='Usage: find-note word [AND|OR word] ["exact phrase"] [prefix*] [--limit N] [--offset N]',
     section=SECTION_NOTES,
     min_args=1,
 )
 @input_error
-def cmd_find_note(args: List[str], storage: Storage) -> str:
-    res = storage.notes.search_text(args[0])
+def cmd_find_note(args: List[str], storage: Storage) -> Output:
+    args, offset, limit = parse_paging(args)
+    if not args:
+        raise IndexError(f"Not enough arguments. {REG.get_help('find-note')}")
+    # Аргументи з пробілами прийшли з лапок — повертаємо лапки, щоб це була фраза
+    query = " ".join(f'"{a}"' if " " in a else a for a in args)
+    res = storage.notes.search_text(query)
     if not res:
         return "No results."
-    out = []
-    for n in res:
-        # додано фіолетовий колір до тегів
-        if n.tags:
-            sorted_tags = sorted(n.tags)
-            formatted_tags = " #".join(sorted_tags)
-            tgs = colored_tag(f"#{formatted_tags}")
-        else:
-            tgs = "(no tags)"
-        out.append(f"{n.title} [{tgs}]\n{n.text}")
-    separator = "\n" + "-" * 40 + "\n"
-    return separator + separator.join(out) + separator
+    stop = None if limit is None else offset + limit
+    page = res[offset:stop]
+    return paged(_note_blocks(page), offset, limit, len(res))
 
 
 @REG.register(
     "find-tag",
-    help="Usage: find-tag tag",
+    help="Usage: find-tag tag [AND|OR|NOT tag ...] [--limit N] [--offset N]",
     section=SECTION_NOTES,
     min_args=1,
+    complete=(ARG_TAGS,),
 )
 @input_error
-def cmd_find_tag(args: List[str], storage: Storage) -> str:
-    res = storage.notes.search_tag(args[0])
+def cmd_find_tag(args: List[str], storage: Storage) -> Output:
+    args, offset, limit = parse_paging(args)
+    if not args:
+        raise IndexError(f"Not enough arguments. {REG.get_help('find-tag')}")
+    res = storage.notes.search_tags(" ".join(args))
     if not res:
         return "No results."
-    out = []
-    for n in res:
-        # Додано фіолетовий колір до тегів
-        if n.tags:
-            sorted_tags = sorted(n.tags)
-            formatted_tags = " #".join(sorted_tags)
-            tgs = colored_tag(f"#{formatted_tags}")
-        else:
-            tgs = "(no tags)"
-        out.append(f"{n.title} [{tgs}]\n{n.text}")
-    separator = "\n" + "-" * 40 + "\n"
-    return separator + separator.join(out) + separator
+    stop = None if limit is None else offset + limit
+    page = res[offset:stop]
+    return paged(_note_blocks(page), offset, limit, len(res))
+
+
+@REG.register(
+    "tags",
+    help="List all tags with number of notes",
+    section=SECTION_NOTES,
+)
+@input_error
+def cmd_tags(args: List[str], storage: Storage) -> str:  # noqa: ARG001
+    counts = storage.notes.tag_counts()
+    if not counts:
+        return "No tags."
+    items = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    return "\n".join(f"{colored_tag('#' + tag)}: {n}" for tag, n in items)
 
 
 @REG.register(
@@ -573,6 +816,7 @@ def cmd_find_tag(args: List[str], storage: Storage) -> str:
     help='Usage: edit-note "Title" new_text...',
     section=SECTION_NOTES,
     min_args=2,
+    complete=(ARG_NOTE,),
 )
 @input_error
 @mutating
@@ -581,7 +825,7 @@ def cmd_edit_note(args: List[str], storage: Storage) -> str:
     new_text = " ".join(args[1:]).strip()
     if not new_text:
         raise ValueError("Note text cannot be empty.")
-    note.text = new_text
+    note.edit_text(new_text)
     return f"Note updated: {args[0]}"
 
 
@@ -590,6 +834,7 @@ def cmd_edit_note(args: List[str], storage: Storage) -> str:
     help='Usage: add-tags "Title" tag1 tag2 ...',
     section=SECTION_NOTES,
     min_args=2,
+    complete=(ARG_NOTE, ARG_TAGS),
 )
 @input_error
 @mutating
@@ -606,6 +851,7 @@ def cmd_tag_add(args: List[str], storage: Storage) -> str:
     help='Usage: delete-tag "Title" tag',
     section=SECTION_NOTES,
     min_args=2,
+    complete=(ARG_NOTE, ARG_NOTE_TAG),
 )
 @input_error
 @mutating
@@ -623,6 +869,7 @@ def cmd_tag_remove(args: List[str], storage: Storage) -> str:
     help='Usage: delete-note "Title"',
     section=SECTION_NOTES,
     min_args=1,
+    complete=(ARG_NOTE,),
 )
 @input_error
 @mutating
@@ -643,14 +890,16 @@ def cmd_hello(args: List[str], storage: Storage) -> str:  # noqa: ARG001
     return "Hello! How can I help you?"
 
 
-@REG.register("help", help="Show help", section=SECTION_SYSTEM)
+@REG.register("help", help="Show help", section=SECTION_SYSTEM, complete=(ARG_COMMAND,))
 @input_error
 def cmd_help(args: List[str], storage: Storage) -> str:  # noqa: ARG001
     if args:
         key = args[0].strip().lower()
         resolved = REG.resolve(key)
         if not resolved:
-            return f"Unknown command: '{args[0]}'"
+            similar = REG.suggest(key)
+            hint = f" Did you mean: {', '.join(similar)}?" if similar else ""
+            return f"Unknown command: '{args[0]}'.{hint}"
         desc = REG.get_help(resolved)
         return f"Command: {resolved}\nDescription: {desc}"
     return REG.help_text()
@@ -667,6 +916,6 @@ def cmd_exit(args: List[str], storage: Storage) -> str:  # noqa: ARG001
 @input_error
 def cmd_version(args: List[str], storage: Storage) -> str:  # noqa: ARG001
     from config import APP_NAME, APP_VERSION
-    from storage import STORAGE_FILE
+    from storage import get_backend
 
-    return f"{APP_NAME} v{APP_VERSION} | data: {STORAGE_FILE}"
+    return f"{APP_NAME} v{APP_VERSION} | data: {get_backend().path}"
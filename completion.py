@@ -0,0 +1,141 @@
+"""
+Автодоповнення команд та аргументів для інтерактивного режиму (prompt_toolkit)
+
+Модуль імпортується лише інтерактивним циклом run_cli(), тому пакетний
+режим та інші неінтерактивні запуски не завантажують prompt_toolkit.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from config import COMPLETION_MAX_ITEMS
+from commands import (
+    REG, ARG_COMMAND, ARG_CONTACT, ARG_EMAIL, ARG_NOTE, ARG_NOTE_TAG, ARG_PHONE, ARG_TAGS
+)
+from storage import storage_read_lock
+
+# ----prompt_toolkit для автокомпліту команд ----
+from prompt_toolkit.completion import Completer, Completion
+
+
+def split_for_completion(text: str) -> Tuple[List[str], str, str]:
+    """
+    Розбити текст до курсора для автодоповнення.
+
+    Повертає (завершені токени, «сирий» фрагмент під курсором, його значення).
+    Лапки враховуються як у parse_input(): 'show-phone "John D' →
+    (['show-phone'], '"John D', 'John D').
+    """
+    tokens: List[str] = []
+    raw = value = ""
+    quote: Optional[str] = None
+    for ch in text:
+        if quote:
+            raw += ch
+            if ch == quote:
+                quote = None
+            else:
+                value += ch
+        elif ch in "\"'":
+            quote = ch
+            raw += ch
+        elif ch.isspace():
+            if raw:
+                tokens.append(value)
+                raw = value = ""
+        else:
+            raw += ch
+            value += ch
+    return tokens, raw, value
+
+
+class HintsCompleter(Completer):
+    def __init__(self, hints, complete_arg_func=None):
+        self.hints = tuple(sorted(set(hints)))
+        # optional callback: (команда, номер аргументу, префікс, аргументи) -> підказки
+        self.complete_arg_func = complete_arg_func
+
+    def get_completions(self, document, complete_event):
+        # приклади:
+        #   "add|"                  -> tokens=[]                    , word='add'
+        #   "add-contact Sa|"       -> tokens=['add-contact']       , word='Sa'
+        #   'change-phone "John D|' -> tokens=['change-phone']      , word='John D'
+        #   'change-phone "John Doe" 0|' -> tokens=['change-phone', 'John Doe'], word='0'
+        tokens, raw, word = split_for_completion(document.text_before_cursor)
+
+        # 1) Підказки для команди (перший токен); якщо за префіксом нічого —
+        #    схожі команди (нечіткий пошук), але лише на явний Tab, а не на
+        #    кожне натискання клавіші
+        if not tokens:
+            low = word.lower()
+            matches = [hint for hint in self.hints if hint.startswith(low)]
+            if not matches and len(low) >= 3 and complete_event.completion_requested:
+                matches = REG.suggest(low)
+            for hint in matches:
+                yield Completion(hint, start_position=-len(raw))
+            return
+
+        # 2) Підказки для аргументів — за типом, заданим у REG.register(complete=...)
+        if self.complete_arg_func:
+            command, args = tokens[0].lower(), tokens[1:]
+            for item in self.complete_arg_func(command, len(args), word, args):
+                text = f'"{item}"' if " " in item else item
+                yield Completion(text, start_position=-len(raw))
+
+
+# отримання імен контактів зі сховища динамічно
+def get_contact_names(storage, prefix: str = "", limit: Optional[int] = COMPLETION_MAX_ITEMS) -> List[str]:
+    """
+    Імена контактів для автодоповнення: до limit імен, що починаються з prefix.
+
+    Використовує відсортований індекс імен AddressBook, тож на кожне натискання
+    клавіші припадає O(log n + limit), а не сортування всієї книги.
+    """
+    try:
+        ab = storage.contacts  # AddressBook
+    except AttributeError:
+        return []
+    return ab.names_starting_with(prefix, limit)
+
+
+def get_arg_completions(storage, command: str, index: int, prefix: str, args: List[str]) -> List[str]:
+    """
+    Підказки для аргументу команди з номером index.
+
+    Тип аргументу береться з REG.arg_kind(); імена, назви нотаток та теги
+    шукаються через відсортовані індекси книг, телефони/email/теги конкретного
+    контакта чи нотатки — серед полів запису з першого аргументу. Нечіткого
+    пошуку тут немає: схожі імена пропонує сама команда, якщо запис не знайдено.
+    Поки фоновий потік записує зміни (і оновлює книги), підказок немає —
+    натискання клавіші не чекає на диск.
+    """
+    with storage_read_lock(blocking=False) as locked:
+        return _arg_completions(storage, command, index, prefix, args) if locked else []
+
+
+def _arg_completions(storage, command: str, index: int, prefix: str, args: List[str]) -> List[str]:
+    kind = REG.arg_kind(command, index)
+    limit = COMPLETION_MAX_ITEMS
+    if kind == ARG_COMMAND:
+        low = prefix.lower()
+        return [c for c in REG.all_commands() if c.startswith(low)][:limit]
+    if kind == ARG_CONTACT:
+        return get_contact_names(storage, prefix)
+    if kind == ARG_NOTE:
+        return storage.notes.titles_starting_with(prefix, limit)
+    if kind == ARG_TAGS:
+        return storage.notes.tags_starting_with(prefix, limit)
+    if kind in (ARG_PHONE, ARG_EMAIL, ARG_NOTE_TAG) and args:
+        try:
+            if kind == ARG_PHONE:
+                values = [p.value for p in storage.contacts.get_record(args[0]).phones]
+            elif kind == ARG_EMAIL:
+                values = [e.value for e in storage.contacts.get_record(args[0]).emails]
+            else:
+                values = list(storage.notes.get_note(args[0]).tags)
+        except KeyError:
+            return []
+        low = prefix.lower()
+        return sorted(v for v in values if v.lower().startswith(low))[:limit]
+    return []
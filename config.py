@@ -27,6 +27,58 @@ BIRTHDAY_FORMAT = "%d.%m.%Y"
 
 # Дні народження за замовчуванням
 UPCOMING_DAYS_DEFAULT = 7
+# Вікно для birthday-stats (днів наперед)
+BIRTHDAY_STATS_DAYS_DEFAULT = 365
+
+# Пакетний режим (--batch): записувати зміни кожні N команд (0 — лише в кінці)
+BATCH_COMMIT_EVERY = 0
+
+# Імпорт контактів: розмір пакета для перевірки та скільки помилок показувати
+IMPORT_BATCH_SIZE = 10_000
+IMPORT_MAX_ERRORS_SHOWN = 5
+
+# Автодоповнення: максимальна кількість підказок імен
+COMPLETION_MAX_ITEMS = 20
+
+# Нечіткий пошук «Did you mean ...»: максимальна відстань редагування
+# (для імен контактів/нотаток менша, бо індекс росте з відстанню)
+FUZZY_MAX_DISTANCE_COMMANDS = 2
+FUZZY_MAX_DISTANCE_NAMES = 1
+FUZZY_MAX_SUGGESTIONS = 3
 
 # Форматування виводу
 SEPARATOR = "\n\n---\n\n"
+# Довгі списки в інтерактивному режимі показуються посторінково (за висотою термінала)
+PAGER_ENABLED = True
+
+# Режим демона (--daemon): ім'я Unix-сокета в директорії даних та затримка,
+# за яку зміни від кількох команд збираються в один запис на диск (секунди)
+DAEMON_SOCKET_NAME = "daemon.sock"
+DAEMON_SAVE_DELAY = 1.0
+
+# Інтерактивний режим: зміни записуються фоновим потоком, який збирає
+# зміни команд протягом цього вікна в один запис (секунди)
+AUTOSAVE_DELAY = 0.5
+
+# Скільки останніх змін пам'ятає стрічка змін кожної книги (changes_since())
+CHANGE_FEED_SIZE = 10_000
+
+# Бекенд зберігання: "pickle" (знімок + журнал) або "sqlite" (окремі таблиці)
+STORAGE_BACKEND = "pickle"
+
+# Журнал змін: команди дописують лише змінені записи замість повного знімка
+JOURNAL_ENABLED = True
+# Журнал ущільнюється у новий знімок, коли його розмір перевищує
+# частку від розміру знімка (але не менше мінімального порогу)
+JOURNAL_COMPACT_RATIO = 0.5
+JOURNAL_COMPACT_MIN_BYTES = 256 * 1024
+
+# Формат знімка: "pickle" (найшвидше завантаження) або "binary" (версіонована
+# схема, binformat.py: менший файл, незалежний від класів models.py, та
+# відображення в пам'ять для --read-only, але читач на Python повільніший);
+# стиснення бінарного знімка: "none", "zlib" або "lzma" (менший файл, повільніший запис)
+SNAPSHOT_FORMAT = "pickle"
+SNAPSHOT_COMPRESSION = "none"
+
+# Кількість попередніх поколінь знімка (storage.pkl.1 ... storage.pkl.N)
+SNAPSHOT_GENERATIONS = 3
@@ -0,0 +1,276 @@
+"""
+Режим демона: дані, індекси та реєстр команд залишаються в пам'яті між викликами
+
+Сервер (asyncio) слухає Unix-сокет у директорії даних і виконує команди
+над одним завантаженим сховищем. Тонкий клієнт не імпортує моделі та
+сховище: розбирає рядок через parse_input() і пересилає (команда, аргументи).
+
+Протокол — рядки JSON в обидва боки:
+    запит:     {"cmd": "add-contact", "args": ["Bob", "0501234567"]}
+               {"op": "shutdown"} — зупинити демон
+    відповідь: {"line": "..."} для кожного рядка виводу, потім
+               {"done": true, "error": false, "exit": false}
+
+Зміни від команд не записуються одразу: протягом DAEMON_SAVE_DELAY секунд
+вони накопичуються і записуються одним записом у журнал (або однією
+транзакцією SQLite). При зупинці демона (SIGTERM/SIGINT, shutdown) все
+незаписане зберігається.
+
+Запуск:
+    python main.py --daemon                       — сервер
+    python main.py --client add-contact Bob 0501234567
+    cat commands.txt | python main.py --client    — команди зі stdin
+    python main.py --stop-daemon
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import socket
+import sys
+
+from config import APP_NAME, DAEMON_SAVE_DELAY, DAEMON_SOCKET_NAME
+from parsing import parse_input
+
+
+def socket_path() -> Path:
+    """Шлях до сокета демона (та сама директорія, що й storage.app_storage_dir())."""
+    return Path.home() / f".{APP_NAME}" / DAEMON_SOCKET_NAME
+
+
+# ==============================
+# Сервер
+# ==============================
+
+
+def serve() -> int:
+    """Запустити демон і обслуговувати клієнтів до сигналу завершення або shutdown."""
+    import asyncio
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Daemon mode requires Unix domain sockets", file=sys.stderr)
+        return 2
+    path = socket_path()
+    if _daemon_running(path):
+        print(f"Daemon is already running: {path}", file=sys.stderr)
+        return 1
+    return asyncio.run(_Daemon(path).run())
+
+
+def _daemon_running(path: Path) -> bool:
+    """Чи відповідає демон на сокеті (сокет, що залишився після збою, видаляється)."""
+    if not path.exists():
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        path.unlink()
+        return False
+    finally:
+        sock.close()
+
+
+class _Daemon:
+    """Стан сервера: сховище в пам'яті та відкладений запис змін."""
+
+    def __init__(self, path: Path) -> None:
+        # Важкі модулі імпортуються лише в процесі сервера
+        from cli import execute_command, format_output
+        from color_helper import BADGE_ERROR, init_colors
+        from storage import (
+            deferred_saves, ensure_storage_dir, flush_changes, open_storage, refresh_storage, storage_lock,
+        )
+
+        init_colors()
+        ensure_storage_dir()
+        self.path = path
+        self.storage = open_storage()
+        self._execute = execute_command
+        self._format = format_output
+        self._badge_error = BADGE_ERROR
+        self._lock = storage_lock
+        self._refresh = refresh_storage
+        self._flush_changes = flush_changes
+        self._deferred = deferred_saves(self.storage)
+        self._flush_handle: Any = None
+        self._stopped: Any = None
+
+    async def run(self) -> int:
+        import asyncio
+        import signal
+
+        loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self._stopped.set)
+
+        server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        self.path.chmod(0o600)
+        print(f"Daemon listening on {self.path}", file=sys.stderr)
+        # Усі команди всередині — з відкладеним записом; записує _flush()
+        with self._deferred:
+            try:
+                await self._stopped.wait()
+            finally:
+                server.close()
+                await server.wait_closed()
+                if self._flush_handle is not None:
+                    self._flush_handle.cancel()
+                if self.path.exists():
+                    self.path.unlink()
+        # Вихід з deferred_saves() записав усі незаписані зміни
+        print("Daemon stopped", file=sys.stderr)
+        return 0
+
+    async def _handle(self, reader: Any, writer: Any) -> None:
+        """Обслужити одне з'єднання: запити виконуються по черзі, без паралелізму."""
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                try:
+                    request = json.loads(raw)
+                except ValueError:
+                    request = {}
+                if not isinstance(request, dict):
+                    # Масив, рядок чи число — теж некоректний запит, а не обрив з'єднання
+                    request = {}
+                if request.get("op") == "shutdown":
+                    self._stopped.set()
+                    writer.write(_encode({"done": True, "error": False, "exit": True}))
+                    break
+                for message in self._run_command(request):
+                    writer.write(_encode(message))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _run_command(self, request: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Виконати команду з запиту та повернути повідомлення відповіді."""
+        cmd, args = request.get("cmd"), request.get("args")
+        if not isinstance(cmd, str) or not isinstance(args, list):
+            yield {"line": f"{self._badge_error} Invalid request", "done": True, "error": True, "exit": False}
+            return
+        with self._lock():
+            # Зміни, записані іншими процесами (CLI поруч з демоном)
+            self._refresh(self.storage)
+            out = self._execute(cmd, [str(a) for a in args], self.storage)
+            if out == "__EXIT__":
+                yield {"done": True, "error": False, "exit": True}
+                return
+            error = isinstance(out, str) and out.startswith(self._badge_error)
+            for line in self._format(out):
+                yield {"line": line}
+        self._schedule_flush()
+        yield {"done": True, "error": error, "exit": False}
+
+    def _schedule_flush(self) -> None:
+        """Запланувати запис змін, якщо їх ще не заплановано (кілька команд — один запис)."""
+        if self._flush_handle is not None or not self._has_changes():
+            return
+        import asyncio
+
+        self._flush_handle = asyncio.get_running_loop().call_later(DAEMON_SAVE_DELAY, self._flush)
+
+    def _has_changes(self) -> bool:
+        if not self.storage.loaded:
+            return False
+        data = self.storage.get()
+        return bool(data.contacts.pending_changes() or data.notes.pending_changes())
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        self._flush_changes(self.storage)
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+# ==============================
+# Клієнт
+# ==============================
+
+
+class DaemonClient:
+    """Блокуюче з'єднання з демоном (без asyncio — клієнт має стартувати швидко)."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(str(path or socket_path()))
+        self._reader = self.sock.makefile("rb")
+
+    def close(self) -> None:
+        self._reader.close()
+        self.sock.close()
+
+    def request(self, message: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Надіслати запит і віддавати повідомлення відповіді до останнього (done)."""
+        self.sock.sendall(_encode(message))
+        for raw in self._reader:
+            reply = json.loads(raw)
+            yield reply
+            if reply.get("done"):
+                return
+        raise ConnectionError("Daemon closed the connection")
+
+    def execute(self, cmd: str, args: List[str]) -> Iterable[Dict[str, Any]]:
+        return self.request({"cmd": cmd, "args": args})
+
+
+def run_client(command: List[str], lines: Optional[Iterable[str]] = None) -> int:
+    """
+    Виконати команду (аргументи командного рядка) або команди з lines через демон.
+
+    Вивід друкується так само, як у пакетному режимі. Повертає кількість
+    помилок (2 — демон не запущено).
+    """
+    try:
+        client = DaemonClient()
+    except OSError:
+        print("Daemon is not running (start it with: python main.py --daemon)", file=sys.stderr)
+        return 2
+    if command:
+        # Аргументи вже розібрані shell — як і parse_input(), ім'я команди без урахування регістру
+        parsed = iter([(command[0].lower(), command[1:])])
+    else:
+        parsed = (parse_input(line) for line in lines or () if line.strip() and not line.lstrip().startswith("#"))
+    errors = 0
+    try:
+        for cmd, args in parsed:
+            if not cmd:
+                continue
+            finished: Dict[str, Any] = {}
+            for reply in client.execute(cmd, args):
+                if "line" in reply:
+                    print(reply["line"])
+                if reply.get("done"):
+                    finished = reply
+            errors += bool(finished.get("error"))
+            if finished.get("exit"):
+                break
+    finally:
+        client.close()
+    return errors
+
+
+def stop_daemon() -> int:
+    """Попросити демон записати зміни та завершитися."""
+    try:
+        client = DaemonClient()
+    except OSError:
+        print("Daemon is not running", file=sys.stderr)
+        return 1
+    try:
+        for _ in client.request({"op": "shutdown"}):
+            pass
+    finally:
+        client.close()
+    return 0
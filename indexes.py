@@ -0,0 +1,595 @@
+"""
+Індекси для швидкого пошуку по контактах та нотатках
+
+Індекси не серіалізуються: книги будують їх при першому запиті
+та оновлюють інкрементально при кожній зміні запису.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from calendar import isleap
+from datetime import date, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import math
+import re
+import shlex
+
+
+class TrigramIndex:
+    """
+    Інкрементальний триграмний індекс для пошуку підрядка.
+
+    Для кожного ключа зберігаються поля в нижньому регістрі, а для кожної
+    триграми — множина ключів, у полях яких вона трапляється. Запит довжиною
+    від 3 символів перевіряється лише на кандидатах (перетин множин для всіх
+    його триграм), коротший — на збережених полях без повторного lower().
+
+    Приклад:
+        idx = TrigramIndex()
+        idx.add("john", ("john doe", "1234567890"))
+        idx.search("doe")  # → ["john"]
+    """
+
+    def __init__(self) -> None:
+        self._fields: Dict[str, Tuple[str, ...]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def _grams(fields: Iterable[str]) -> Set[str]:
+        """Триграми всіх полів (без триграм на стику полів)."""
+        return {f[i:i + 3] for f in fields for i in range(len(f) - 2)}
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def add(self, key: str, fields: Iterable[str]) -> None:
+        """Додати або переіндексувати ключ."""
+        self.remove(key)
+        stored = tuple(f for f in fields if f)
+        self._fields[key] = stored
+        for g in self._grams(stored):
+            self._postings.setdefault(g, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        """Прибрати ключ з індексу."""
+        stored = self._fields.pop(key, None)
+        if stored is None:
+            return
+        for g in self._grams(stored):
+            keys = self._postings.get(g)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[g]
+
+    def search(self, query: str) -> List[str]:
+        """Ключі, в полях яких трапляється підрядок query (без урахування регістру)."""
+        q = query.lower().strip()
+        if len(q) < 3:
+            candidates: Iterable[str] = self._fields.keys()
+        else:
+            posting_sets = sorted(
+                (self._postings.get(g, set()) for g in self._grams((q,))), key=len
+            )
+            found = set(posting_sets[0])
+            for keys in posting_sets[1:]:
+                if not found:
+                    break
+                found &= keys
+            candidates = found
+        return [k for k in candidates if any(q in f for f in self._fields[k])]
+
+
+# Слово: літери/цифри (зокрема кирилиця), з апострофами всередині (м'ята, п’ять)
+_WORD_RE = re.compile(r"\w+(?:['’ʼ]\w+)*")
+_APOSTROPHES = str.maketrans({"’": "'", "ʼ": "'"})
+
+
+def tokenize(text: str) -> List[str]:
+    """Розбити текст на слова в нижньому регістрі (українська та англійська)."""
+    return _WORD_RE.findall(text.lower().translate(_APOSTROPHES))
+
+
+class FullTextIndex:
+    """
+    Повнотекстовий індекс з ранжуванням BM25.
+
+    Для кожного слова зберігається список документів з позиціями слова
+    (позиції потрібні для пошуку фраз). Запит:
+        hello world          — обидва слова (AND, за замовчуванням)
+        hello AND world      — те саме, явно
+        hello OR world       — хоча б одна група
+        "hello world"        — точна фраза
+        hel*                 — слова з префіксом
+    Вартість запиту залежить від довжини списків документів для слів
+    запиту, а не від загального обсягу тексту.
+    """
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self) -> None:
+        # слово → {ключ документа → позиції слова}
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        # ключ документа → (кількість слів, множина слів)
+        self._docs: Dict[str, Tuple[int, Set[str]]] = {}
+        self._total_len = 0
+        self._vocab: Optional[List[str]] = None  # відсортований словник для префіксів
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, key: str, *texts: str) -> None:
+        """Додати або переіндексувати документ (кілька текстових полів)."""
+        self.remove(key)
+        positions: Dict[str, List[int]] = {}
+        pos = 0
+        for text in texts:
+            for token in tokenize(text):
+                positions.setdefault(token, []).append(pos)
+                pos += 1
+            pos += 1  # фраза не може перетинати межу полів
+        for token, plist in positions.items():
+            if token not in self._postings:
+                self._postings[token] = {}
+                self._vocab = None
+            self._postings[token][key] = plist
+        length = sum(len(p) for p in positions.values())
+        self._docs[key] = (length, set(positions))
+        self._total_len += length
+
+    def remove(self, key: str) -> None:
+        """Прибрати документ з індексу."""
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        length, tokens = doc
+        self._total_len -= length
+        for token in tokens:
+            docs = self._postings[token]
+            docs.pop(key, None)
+            if not docs:
+                del self._postings[token]
+                self._vocab = None
+
+    # ----- Розбір запиту -----
+    @staticmethod
+    def parse_query(query: str) -> List[List[List[str]]]:
+        """
+        Розібрати запит на групи OR, кожна з яких — список умов AND.
+        Умова — список слів (одне слово або фраза).
+        """
+        try:
+            parts = shlex.split(query, posix=True)
+        except ValueError:
+            parts = query.split()
+        groups: List[List[List[str]]] = [[]]
+        for part in parts:
+            if part == "OR":
+                groups.append([])
+            elif part == "AND":
+                continue
+            else:
+                prefix = part.endswith("*")
+                words = tokenize(part)
+                if prefix and len(words) == 1:
+                    words[0] += "*"
+                if words:
+                    groups[-1].append(words)
+        return [g for g in groups if g]
+
+    # ----- Пошук -----
+    def _expand(self, term: str) -> List[str]:
+        """Слова словника, що відповідають терму (з урахуванням префікса)."""
+        if not term.endswith("*"):
+            return [term] if term in self._postings else []
+        prefix = term[:-1]
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        out = []
+        i = bisect_left(self._vocab, prefix)
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            out.append(self._vocab[i])
+            i += 1
+        return out
+
+    def _term_docs(self, term: str) -> Set[str]:
+        docs: Set[str] = set()
+        for word in self._expand(term):
+            docs.update(self._postings[word])
+        return docs
+
+    def _phrase_docs(self, words: List[str]) -> Set[str]:
+        """Документи, де слова йдуть поспіль."""
+        if any(w.endswith("*") for w in words):
+            words = [w.rstrip("*") for w in words]
+        lists = [self._postings.get(w) for w in words]
+        if any(lst is None for lst in lists):
+            return set()
+        candidates = set.intersection(*(set(lst) for lst in lists))  # type: ignore[union-attr]
+        found = set()
+        for key in candidates:
+            starts = set(lists[0][key])  # type: ignore[index]
+            for offset, lst in enumerate(lists[1:], start=1):
+                starts &= {p - offset for p in lst[key]}  # type: ignore[index]
+                if not starts:
+                    break
+            if starts:
+                found.add(key)
+        return found
+
+    def _condition_docs(self, words: List[str]) -> Set[str]:
+        return self._term_docs(words[0]) if len(words) == 1 else self._phrase_docs(words)
+
+    def search(self, query: str) -> List[str]:
+        """Ключі документів, що відповідають запиту, від найрелевантнішого."""
+        groups = self.parse_query(query)
+        matched: Set[str] = set()
+        for conditions in groups:
+            sets = sorted((self._condition_docs(c) for c in conditions), key=len)
+            found = sets[0]
+            for docs in sets[1:]:
+                if not found:
+                    break
+                found = found & docs
+            matched |= found
+        if not matched:
+            return []
+
+        terms = {w for g in groups for c in g for w in c}
+        scores = self._score(matched, terms)
+        return sorted(matched, key=lambda k: (-scores[k], k))
+
+    def _score(self, keys: Set[str], terms: Set[str]) -> Dict[str, float]:
+        """BM25-оцінка для знайдених документів."""
+        n = len(self._docs)
+        avgdl = self._total_len / n if n else 0.0
+        scores = dict.fromkeys(keys, 0.0)
+        for term in terms:
+            for word in self._expand(term):
+                docs = self._postings[word]
+                idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                for key in keys:
+                    plist = docs.get(key)
+                    if not plist:
+                        continue
+                    tf = len(plist)
+                    dl = self._docs[key][0]
+                    norm = self.K1 * (1 - self.B + self.B * dl / avgdl) if avgdl else self.K1
+                    scores[key] += idf * tf * (self.K1 + 1) / (tf + norm)
+        return scores
+
+
+class TagIndex:
+    """
+    Інвертований індекс тегів: тег → множина ключів нотаток.
+
+    Запит find-tag обчислюється операціями над множинами:
+        work urgent          — обидва теги (AND за замовчуванням)
+        work OR home         — хоча б один
+        work NOT done        — з тегом work, але без done
+    """
+
+    def __init__(self) -> None:
+        self._keys: Dict[str, Set[str]] = {}
+        self._tags: Dict[str, Set[str]] = {}  # ключ → теги (для оновлення)
+        self._sorted: Optional[List[str]] = None  # відсортовані теги для префіксів
+
+    def add(self, key: str, tags: Iterable[str]) -> None:
+        """Додати або оновити теги нотатки."""
+        new_tags = set(tags)
+        old_tags = self._tags.get(key, set())
+        for tag in old_tags - new_tags:
+            self._discard(tag, key)
+        for tag in new_tags - old_tags:
+            if tag not in self._keys:
+                self._keys[tag] = set()
+                self._sorted = None
+            self._keys[tag].add(key)
+        self._tags[key] = new_tags
+
+    def remove(self, key: str) -> None:
+        """Прибрати нотатку з індексу."""
+        for tag in self._tags.pop(key, set()):
+            self._discard(tag, key)
+
+    def _discard(self, tag: str, key: str) -> None:
+        keys = self._keys.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[tag]
+                self._sorted = None
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Теги, що починаються з prefix, за алфавітом (не більше limit)."""
+        if self._sorted is None:
+            self._sorted = sorted(self._keys)
+        out: List[str] = []
+        i = bisect_left(self._sorted, prefix)
+        while i < len(self._sorted) and self._sorted[i].startswith(prefix):
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(self._sorted[i])
+            i += 1
+        return out
+
+    def keys_for(self, tag: str) -> Set[str]:
+        """Ключі нотаток з тегом."""
+        return self._keys.get(tag, set())
+
+    def counts(self) -> Dict[str, int]:
+        """Кількість нотаток для кожного тегу."""
+        return {tag: len(keys) for tag, keys in self._keys.items()}
+
+    def query(self, query: str) -> Set[str]:
+        """Ключі нотаток, що відповідають запиту з AND/OR/NOT."""
+        groups: List[Tuple[List[str], List[str]]] = [([], [])]
+        negate = False
+        for part in query.split():
+            if part == "OR":
+                groups.append(([], []))
+            elif part == "AND":
+                continue
+            elif part == "NOT":
+                negate = True
+            else:
+                tag = part.lstrip("#").lower()
+                groups[-1][1 if negate else 0].append(tag)
+                negate = False
+
+        result: Set[str] = set()
+        for include, exclude in groups:
+            if not include and not exclude:
+                continue
+            if include:
+                sets = sorted((self.keys_for(t) for t in include), key=len)
+                found = set(sets[0])
+                for keys in sets[1:]:
+                    found &= keys
+            else:
+                found = set(self._tags)
+            for tag in exclude:
+                found -= self.keys_for(tag)
+            result |= found
+        return result
+
+
+class BirthdayCalendar:
+    """
+    Календар днів народження: (місяць, день) → множина ключів контактів.
+
+    Запит «найближчі N днів» перебирає дні вікна, а не всі контакти,
+    тож коштує O(днів + знайдених). Правило 29 лютого таке саме, як у
+    Record.get_next_birthday(): у невисокосний рік день народження — 1 березня.
+    """
+
+    def __init__(self) -> None:
+        self._days: Dict[Tuple[int, int], Set[str]] = {}
+        self._by_key: Dict[str, Tuple[int, int]] = {}
+
+    def add(self, key: str, month: int, day: int) -> None:
+        """Додати або перемістити день народження контакта."""
+        self.remove(key)
+        self._by_key[key] = (month, day)
+        self._days.setdefault((month, day), set()).add(key)
+
+    def remove(self, key: str) -> None:
+        """Прибрати контакт з календаря."""
+        md = self._by_key.pop(key, None)
+        if md is None:
+            return
+        keys = self._days[md]
+        keys.discard(key)
+        if not keys:
+            del self._days[md]
+
+    def upcoming(self, today: date, days: int) -> Iterator[Tuple[int, date, Set[str]]]:
+        """
+        Дні з днями народження у вікні [today, today + days].
+        Повертає (днів_до, дата, ключі) у порядку зростання дати.
+        """
+        # Наступний день народження завжди в межах року, тож довше вікно зайве
+        seen: Set[str] = set()
+        for delta in range(min(days, 366) + 1):
+            d = today + timedelta(days=delta)
+            keys = set(self._days.get((d.month, d.day), ()))
+            if d.month == 3 and d.day == 1 and not isleap(d.year):
+                keys |= self._days.get((2, 29), set())
+            # Вікно у рік містить той самий день двічі — беремо найближчий
+            keys -= seen
+            if keys:
+                seen |= keys
+                yield delta, d, keys
+
+
+class SortedIndex:
+    """
+    Ключі, відсортовані за значенням (ім'я в нижньому регістрі, дата створення, ...).
+
+    Підтримується інкрементально (bisect), тож префіксний пошук та діапазони
+    коштують O(log n + k), а впорядкований обхід не потребує sorted() на кожен
+    запит. Значення — будь-які порівнювані між собою об'єкти одного типу;
+    при рівних значеннях порядок — за ключем.
+    """
+
+    def __init__(self) -> None:
+        self._items: List[Tuple[Any, str]] = []  # (значення, ключ)
+        self._values: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @classmethod
+    def build(cls, pairs: Iterable[Tuple[str, Any]]) -> "SortedIndex":
+        """Побудувати індекс з пар (ключ, значення) одним сортуванням, а не n вставками."""
+        index = cls()
+        index._values = dict(pairs)
+        index._items = sorted((value, key) for key, value in index._values.items())
+        return index
+
+    def add(self, key: str, value: Any) -> None:
+        """Додати ключ або оновити його значення."""
+        if key in self._values and self._values[key] == value:
+            return
+        self.remove(key)
+        insort(self._items, (value, key))
+        self._values[key] = value
+
+    def remove(self, key: str) -> None:
+        """Прибрати ключ."""
+        if key not in self._values:
+            return
+        value = self._values.pop(key)
+        i = bisect_left(self._items, (value, key))
+        del self._items[i]
+
+    def keys(self, offset: int = 0, limit: Optional[int] = None, reverse: bool = False) -> Iterator[str]:
+        """
+        Ключі за зростанням (reverse — за спаданням) значення: сторінка [offset, offset + limit).
+
+        Сторінка береться за позиціями у списку, а не пропуском offset елементів:
+        O(k) незалежно від того, наскільки далеко вона від початку.
+        """
+        n = len(self._items)
+        start = min(offset, n)
+        stop = n if limit is None else min(offset + limit, n)
+        if reverse:
+            return self._iter_keys(range(n - 1 - start, n - 1 - stop, -1))
+        return self._iter_keys(range(start, stop))
+
+    def _iter_keys(self, positions: range) -> Iterator[str]:
+        items = self._items
+        for i in positions:
+            yield items[i][1]
+
+    def key_list(self) -> List[str]:
+        """Усі ключі за зростанням значення (швидше за list(keys()) для повного обходу)."""
+        return [key for _, key in self._items]
+
+    def range(self, low: Any = None, high: Any = None) -> Iterator[str]:
+        """Ключі зі значенням у діапазоні low <= значення < high (None — без межі), за зростанням."""
+        start = 0 if low is None else bisect_left(self._items, (low,))
+        stop = len(self._items) if high is None else bisect_left(self._items, (high,))
+        return self._iter_keys(range(start, stop))
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Ключі, значення яких починається з prefix (не більше limit)."""
+        out: List[str] = []
+        i = bisect_left(self._items, (prefix, ""))
+        while i < len(self._items) and self._items[i][0].startswith(prefix):
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(self._items[i][1])
+            i += 1
+        return out
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Відстань Дамерау–Левенштейна (з перестановкою сусідніх символів).
+    Якщо відстань більша за max_distance, повертає max_distance + 1.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    # Спільні початок і кінець не впливають на відстань — рахуємо лише середину
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return min(prev[-1], max_distance + 1)
+
+
+class FuzzyIndex:
+    """
+    Нечіткий пошук за відстанню редагування (схема SymSpell).
+
+    Для кожного терміна в індекс кладуться всі варіанти повного терміна з
+    видаленими до max_distance символами; запит генерує такі ж варіанти.
+    Терміни в межах max_distance мають спільний варіант, а решта —
+    здебільшого ні, тож кандидатів мало навіть тоді, коли тисячі термінів
+    мають спільний початок ("Person 1", "Person 2", ...). Кандидати
+    перевіряються від найближчих варіантів (менше видалень) і не більше
+    max_checks штук, тому час запиту обмежений незалежно від кількості
+    термінів. Кількість варіантів росте як len ** max_distance, тому для
+    імен і назв max_distance — 1, а 2 — лише для короткого списку команд.
+    """
+
+    def __init__(self, max_distance: int = 2, max_checks: int = 50) -> None:
+        self.max_distance = max_distance
+        self.max_checks = max_checks
+        self._deletes: Dict[str, Set[str]] = {}
+        self._terms: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _levels(self, term: str) -> List[Set[str]]:
+        """Варіанти терміна за кількістю видалених символів: [{term}, 1 видалення, ...]."""
+        level = {term}
+        levels = [level]
+        for _ in range(self.max_distance):
+            level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))}
+            levels.append(level)
+        return levels
+
+    def _variants(self, term: str) -> Set[str]:
+        """Термін та всі його варіанти з видаленими символами."""
+        return set().union(*self._levels(term))
+
+    def add(self, term: str) -> None:
+        """Додати термін."""
+        if term in self._terms:
+            return
+        self._terms.add(term)
+        for v in self._variants(term):
+            self._deletes.setdefault(v, set()).add(term)
+
+    def remove(self, term: str) -> None:
+        """Прибрати термін."""
+        if term not in self._terms:
+            return
+        self._terms.discard(term)
+        for v in self._variants(term):
+            terms = self._deletes.get(v)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._deletes[v]
+
+    def _candidates(self, query: str) -> Iterator[str]:
+        """Терміни зі спільним з query варіантом, від варіантів з найменшою кількістю видалень."""
+        seen: Set[str] = set()
+        for level in self._levels(query):
+            for v in level:
+                for term in self._deletes.get(v, ()):
+                    if term not in seen:
+                        seen.add(term)
+                        yield term
+
+    def lookup(self, query: str, limit: int = 5) -> List[str]:
+        """Найближчі терміни в межах max_distance — спочатку найближчі."""
+        scored = []
+        for term in islice(self._candidates(query), self.max_checks):
+            d = edit_distance(query, term, self.max_distance)
+            if d <= self.max_distance:
+                scored.append((d, term))
+        scored.sort()
+        return [term for _, term in scored[:limit]]
@@ -6,12 +6,127 @@
 - Управління контактами з валідацією та пошуком
 - Записна книжка з тегами та пошуком
 - Список найближчих днів народження
- - Список найближчих днів народження
 - Автоматичне збереження даних
+- Пакетне виконання команд з файлу або stdin (--batch)
+- Режим демона з тонким клієнтом (--daemon / --client)
+- Відкриття лише для читання (--read-only): з бінарним знімком записи
+  декодуються на вимогу, інші знімки завантажуються повністю
+
+Запуск:
+    python main.py                       — інтерактивний режим
+    python main.py --batch commands.txt  — команди з файлу
+    cat commands.txt | python main.py    — команди зі stdin
+    python main.py --profile-startup     — час імпорту модулів та завантаження даних
+    python main.py --daemon              — тримати дані в пам'яті, команди через Unix-сокет
+    python main.py --client CMD ARGS     — виконати команду через запущений демон
+    python main.py --read-only           — перегляд без змін (бінарний знімок відображається в пам'ять)
 """
 
-from cli import run_cli
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Tuple
+import argparse
+import importlib
+import sys
+import time
+
+from config import BATCH_COMMIT_EVERY
+
+
+def profile_startup(read_only: bool = False) -> int:
+    """
+    Виміряти фази старту: імпорт модулів (кожен — без уже імпортованих
+    залежностей), підготовку інтерфейсу та завантаження даних з диска.
+    Звіт виводиться у stderr.
+    """
+    phases: List[Tuple[str, float]] = []
+
+    def phase(name: str, func: Callable[[], object]) -> None:
+        started = time.perf_counter()
+        func()
+        phases.append((name, time.perf_counter() - started))
+
+    for module in ("models", "storage", "commands", "cli"):
+        phase(f"import {module}", lambda name=module: importlib.import_module(name))
+    phase("import prompt_toolkit + completion", lambda: importlib.import_module("completion"))
+
+    from color_helper import init_colors
+    from storage import get_backend, load_storage
+
+    phase("colorama init", init_colors)
+    if read_only:
+        phase(f"map data read-only ({get_backend().path.name})", get_backend().load_read_only)
+    else:
+        phase(f"load data ({get_backend().path.name})", load_storage)
+
+    width = max(len(name) for name, _ in phases)
+    for name, seconds in phases:
+        print(f"{name:<{width}}  {seconds * 1000:8.1f} ms", file=sys.stderr)
+    total = sum(seconds for _, seconds in phases)
+    print(f"{'total':<{width}}  {total * 1000:8.1f} ms", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Personal assistant CLI")
+    parser.add_argument(
+        "--batch", metavar="FILE",
+        help="execute commands from FILE ('-' for stdin) without the interactive prompt",
+    )
+    parser.add_argument(
+        "--commit-every", type=int, default=BATCH_COMMIT_EVERY, metavar="N",
+        help="in batch mode, write changes every N commands (default: once at the end)",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="in batch mode, print only the summary",
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="report per-phase import and data load timings and exit",
+    )
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="serve commands over a Unix socket, keeping data in memory between calls",
+    )
+    parser.add_argument(
+        "--client", nargs=argparse.REMAINDER, metavar="COMMAND",
+        help="run COMMAND (or commands from stdin, if omitted) through the running daemon",
+    )
+    parser.add_argument("--stop-daemon", action="store_true", help="save changes and stop the daemon")
+    parser.add_argument(
+        "--read-only", action="store_true",
+        help="open data read-only: commands that change data are refused; with SNAPSHOT_FORMAT = \"binary\" "
+             "records are decoded on demand, other snapshots are loaded in full",
+    )
+    opts = parser.parse_args(argv)
+
+    if opts.profile_startup:
+        return profile_startup(opts.read_only)
+
+    if opts.daemon or opts.client is not None or opts.stop_daemon:
+        import daemon
+
+        if opts.daemon:
+            return daemon.serve()
+        if opts.stop_daemon:
+            return daemon.stop_daemon()
+        errors = daemon.run_client(opts.client, None if opts.client else sys.stdin)
+        return min(errors, 2) if errors else 0
+
+    from cli import run_batch, run_cli
+
+    # Якщо stdin — не термінал (pipe), працюємо в пакетному режимі
+    if opts.batch is not None or not sys.stdin.isatty():
+        path = opts.batch or "-"
+        if path == "-":
+            errors = run_batch(sys.stdin, opts.commit_every, opts.quiet, read_only=opts.read_only)
+        else:
+            with open(path, encoding="utf-8") as f:
+                errors = run_batch(f, opts.commit_every, opts.quiet, read_only=opts.read_only)
+        return 1 if errors else 0
+
+    return run_cli(opts.read_only)
 
 
 if __name__ == "__main__":
-    run_cli()
+    sys.exit(main())
@@ -5,18 +5,45 @@
 from __future__ import annotations
 
 from collections import UserDict
-from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 import re
+import sys
 from calendar import isleap  # === ДОДАНО ===
 
+from changes import CREATED, DELETED, MODIFIED, Change, ChangeTracker
 from config import (
     BIRTHDAY_FORMAT,
     EMAIL_REGEX,
+    FUZZY_MAX_DISTANCE_NAMES,
+    FUZZY_MAX_SUGGESTIONS,
     PHONE_DIGITS,
     PHONE_REGEX,
 )
+from indexes import (
+    BirthdayCalendar,
+    FullTextIndex,
+    FuzzyIndex,
+    SortedIndex,
+    TagIndex,
+    TrigramIndex,
+)
+
+
+class NotFoundError(KeyError):
+    """
+    Контакт або нотатку не знайдено.
+
+    suggestions() повертає схожі імена (нечіткий пошук рахується лише
+    на вимогу, щоб не сповільнювати перевірки на кшталт «чи існує контакт»).
+    """
+
+    def __init__(self, name: str, suggest: Optional[Callable[[], List[str]]] = None) -> None:
+        super().__init__(name)
+        self._suggest = suggest
+
+    def suggestions(self) -> List[str]:
+        return self._suggest() if self._suggest else []
 
 
 # ==============================
@@ -25,12 +52,27 @@ from config import (
 
 
 class Field:
-    """Базове поле з рядковим значенням."""
+    """
+    Базове поле з рядковим значенням.
+
+    Поля та контакти використовують __slots__ (без __dict__ на кожен об'єкт):
+    на мільйонах контактів саме накладні витрати на об'єкт визначають пам'ять.
+    У pickle поле зберігається як голий рядок.
+    """
+
+    __slots__ = ("_value",)
 
     def __init__(self, value: str) -> None:
         self._value = None
         self.value = value  # викликає setter
 
+    def __getstate__(self) -> Optional[str]:
+        return self._value
+
+    def __setstate__(self, state: Any) -> None:
+        # Старі знімки (до __slots__) містять словник {"_value": ...}
+        self._value = state.get("_value") if isinstance(state, dict) else state
+
     @property
     def value(self) -> str:
         if self._value is None:
@@ -50,12 +92,14 @@ class Field:
 class Name(Field):
     """Ім'я контакта."""
 
-    pass
+    __slots__ = ()
 
 
 class Phone(Field):
     """Телефон: рівно 10 цифр."""
 
+    __slots__ = ()
+
     _re = re.compile(PHONE_REGEX)
 
     @Field.value.setter  # type: ignore[attr-defined]
@@ -69,6 +113,8 @@ class Phone(Field):
 class Email(Field):
     """Email з базовою валідацією."""
 
+    __slots__ = ()
+
     _re = re.compile(EMAIL_REGEX)
 
     @Field.value.setter  # type: ignore[attr-defined]
@@ -82,24 +128,58 @@ class Email(Field):
 class Address(Field):
     """Адреса контакта."""
 
-    pass
+    __slots__ = ()
 
 
 class Birthday(Field):
-    """Дата народження у форматі DD.MM.YYYY."""
+    """
+    Дата народження у форматі DD.MM.YYYY.
 
-    @Field.value.setter  # type: ignore[attr-defined]
+    Зберігається як порядковий номер дня (date.toordinal()): рядок розбирається
+    один раз при створенні, а value форматується лише при першому показі
+    (і кешується в _value). as_date() не викликає strptime, тож пошук днів
+    народження не розбирає рядки.
+    """
+
+    __slots__ = ("_ordinal",)
+
+    @property
+    def value(self) -> str:
+        if self._value is None:
+            self._value = date.fromordinal(self._ordinal).strftime(BIRTHDAY_FORMAT)
+        return self._value
+
+    @value.setter
     def value(self, new_value: str) -> None:
         s = (new_value or "").strip()
         try:
             dt = datetime.strptime(s, BIRTHDAY_FORMAT)
         except ValueError:
             raise ValueError(f"Birthday must be in {BIRTHDAY_FORMAT} format.")
-        self._value = dt.strftime(BIRTHDAY_FORMAT)
+        self._ordinal = dt.toordinal()
+        self._value = None
+
+    @property
+    def ordinal(self) -> int:
+        """Порядковий номер дати (date.toordinal())."""
+        return self._ordinal
 
     def as_date(self) -> date:
         """Перетворити на об'єкт date."""
-        return datetime.strptime(self.value, BIRTHDAY_FORMAT).date()
+        return date.fromordinal(self._ordinal)
+
+    def __getstate__(self) -> int:  # type: ignore[override]
+        return self._ordinal
+
+    def __setstate__(self, state: Any) -> None:
+        # Міграція старих знімків і журналів при load_storage():
+        # до __slots__ — словник {"_value": "DD.MM.YYYY"}, потім — рядок
+        if isinstance(state, dict):
+            state = state.get("_value")
+        if isinstance(state, str):
+            state = datetime.strptime(state, BIRTHDAY_FORMAT).toordinal()
+        self._value = None
+        self._ordinal = state
 
 
 # ==============================
@@ -125,24 +205,57 @@ class Record:
         print(rec.days_to_birthday())  # кількість днів до ДН
     """
 
+    __slots__ = ("name", "phones", "emails", "address", "birthday", "_owner")
+
     def __init__(self, name: Name) -> None:
         self.name: Name = name
         self.phones: List[Phone] = []
         self.emails: List[Email] = []
         self.address: Optional[Address] = None
         self.birthday: Optional[Birthday] = None
+        # Книга, що містить запис (не серіалізується, відновлюється книгою)
+        self._owner: Optional["AddressBook"] = None
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return (self.name, self.phones, self.emails, self.address, self.birthday)
+
+    def __setstate__(self, state: Any) -> None:
+        if isinstance(state, dict):
+            # Старі знімки (до __slots__): словник атрибутів
+            state = tuple(state.get(k) for k in ("name", "phones", "emails", "address", "birthday"))
+        self.name, self.phones, self.emails, self.address, self.birthday = state
+        self.phones = self.phones or []
+        self.emails = self.emails or []
+        self._owner = None
+
+    def _changed(self) -> None:
+        """Повідомити книгу контактів про зміну запису."""
+        if self._owner is not None:
+            self._owner.mark_changed(self.name.value)
+
+    def search_fields(self) -> Tuple[str, ...]:
+        """Значення полів для пошуку (у нижньому регістрі)."""
+        return (
+            self.name.value.lower(),
+            *(p.value for p in self.phones),
+            *(e.value.lower() for e in self.emails),
+            self.address.value.lower() if self.address else "",
+            self.birthday.value if self.birthday else "",
+        )
 
     # ----- Телефони -----
     def add_phone(self, phone: Phone) -> None:
         """Додати номер телефону."""
         if phone.value not in [p.value for p in self.phones]:
             self.phones.append(phone)
+            self._changed()
 
     def remove_phone(self, phone_value: str) -> bool:
         """Видалити номер телефону за значенням."""
         for i, p in enumerate(self.phones):
             if p.value == phone_value:
                 self.phones.pop(i)
+                self._changed()
                 return True
         return False
 
@@ -151,6 +264,7 @@ class Record:
         for p in self.phones:
             if p.value == old_value:
                 p.value = new_value  # викликає валідацію
+                self._changed()
                 return
         raise KeyError(f"Phone '{old_value}' not found for contact '{self.name}'.")
 
@@ -159,12 +273,14 @@ class Record:
         """Додати email."""
         if email.value not in [e.value for e in self.emails]:
             self.emails.append(email)
+            self._changed()
 
     def remove_email(self, email_value: str) -> bool:
         """Видалити email за значенням."""
         for i, e in enumerate(self.emails):
             if e.value == email_value:
                 self.emails.pop(i)
+                self._changed()
                 return True
         return False
 
@@ -172,11 +288,13 @@ class Record:
     def set_address(self, address: Address) -> None:
         """Встановити адресу."""
         self.address = address
+        self._changed()
 
     def remove_address(self) -> bool:
         """Видалити адресу."""
         if self.address:
             self.address = None
+            self._changed()
             return True
         return False
 
@@ -184,6 +302,7 @@ class Record:
     def set_birthday(self, bday: Birthday) -> None:
         """Встановити день народження."""
         self.birthday = bday
+        self._changed()
 
     def days_to_birthday(self, today: Optional[date] = None) -> Optional[int]:
         """
@@ -251,47 +370,239 @@ class Record:
         return " | ".join(parts)
 
 
+def _contact_state(rec: Record) -> Tuple[Any, ...]:
+    """Значення полів контакта для порівняння (у Record немає __eq__)."""
+    return (
+        rec.name.value,
+        [p.value for p in rec.phones],
+        [e.value for e in rec.emails],
+        rec.address.value if rec.address is not None else None,
+        rec.birthday.ordinal if rec.birthday is not None else None,
+    )
+
+
+def _replace_data(book: Any, data: Dict[str, Any], same: Callable[[Any, Any], bool]) -> None:
+    """
+    Замінити записи книги свіжо прочитаними з диска, зберігши її облік змін.
+
+    Ключі, що відрізняються від поточних, потрапляють у стрічку як уже записані
+    зміни (версії зростають); незаписані локальні зміни переносяться поверх.
+    """
+    changes = book._changes
+    old, pending = book.data, changes.pending
+    for key in pending:
+        obj = old.get(key)
+        if obj is None:
+            data.pop(key, None)
+        else:
+            data[key] = obj
+    for key, obj in data.items():
+        obj._owner = book
+        if key in pending:
+            continue
+        prev = old.get(key)
+        if prev is None:
+            changes.record(key, CREATED, pending=False)
+        elif not same(prev, obj):
+            changes.record(key, MODIFIED, pending=False)
+    for key in old:
+        if key not in data and key not in pending:
+            changes.record(key, DELETED, pending=False)
+    book.data = data
+    book.reset_indexes()
+
+
 class AddressBook(UserDict):
     """Книга контактів (ім'я → Record)."""
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Незаписані зміни, версії контактів та стрічка змін
+        self._changes = ChangeTracker()
+        # Індекси будуються при першому запиті
+        self._search_index: Optional[TrigramIndex] = None
+        self._birthday_index: Optional[BirthdayCalendar] = None
+        self._name_index: Optional[SortedIndex] = None
+        self._fuzzy_index: Optional[FuzzyIndex] = None
+        super().__init__(*args, **kwargs)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"data": self.data}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.data = state["data"]
+        self._changes = ChangeTracker()
+        self.reset_indexes()
+        for rec in self.data.values():
+            rec._owner = self
+
+    def reset_indexes(self) -> None:
+        """Скинути індекси (перебудуються при наступному запиті), напр. після зміни даних ззовні."""
+        self._search_index = None
+        self._birthday_index = None
+        self._name_index = None
+        self._fuzzy_index = None
+
+    def mark_changed(self, name: str, kind: str = MODIFIED) -> None:
+        """Позначити контакт як створений/змінений/видалений (kind) та оновити індекси."""
+        key = name.strip().lower()
+        self._changes.record(key, kind)
+        self._reindex(key)
+
+    def _reindex(self, key: str) -> None:
+        """Оновити індекси для одного контакта (після зміни чи видалення)."""
+        if (
+            self._search_index is None and self._birthday_index is None
+            and self._name_index is None and self._fuzzy_index is None
+        ):
+            return
+        record = self.data.get(key)
+        if self._name_index is not None:
+            if record is None:
+                self._name_index.remove(key)
+            else:
+                self._name_index.add(key, key)
+        if self._fuzzy_index is not None:
+            if record is None:
+                self._fuzzy_index.remove(key)
+            else:
+                self._fuzzy_index.add(key)
+        if self._search_index is not None:
+            if record is None:
+                self._search_index.remove(key)
+            else:
+                self._search_index.add(key, record.search_fields())
+        if self._birthday_index is not None:
+            self._index_birthday(key, record)
+
+    def _index_birthday(self, key: str, record: Optional[Record]) -> None:
+        if record is None or record.birthday is None:
+            self._birthday_index.remove(key)  # type: ignore[union-attr]
+            return
+        born = record.birthday.as_date()
+        self._birthday_index.add(key, born.month, born.day)  # type: ignore[union-attr]
+
+    def pop_changes(self) -> Dict[str, str]:
+        """Повернути незаписані зміни (ключ → created/modified/deleted) та очистити їх."""
+        return self._changes.pop()
+
+    def pending_changes(self) -> Dict[str, str]:
+        """Зміни контактів, ще не записані на диск (без очищення)."""
+        return dict(self._changes.pending)
+
+    def replace_data(self, data: Dict[str, Any]) -> None:
+        """
+        Замінити дані свіжими з диска (інший процес записав новий знімок):
+        стрічка змін і версії продовжуються, а не починаються з нуля.
+        """
+        _replace_data(self, data, lambda a, b: _contact_state(a) == _contact_state(b))
+
+    def invalidate_changes(self) -> None:
+        """Дані змінено ззовні, але невідомо які (див. ChangeTracker.invalidate())."""
+        self._changes.invalidate()
+
+    def restore_changes(self, changes: Dict[str, str]) -> None:
+        """Повернути зміни з pop_changes(), які не вдалося записати (буде повторено наступним записом)."""
+        self._changes.restore(changes)
+
+    @property
+    def change_seq(self) -> int:
+        """Номер останньої зміни в книзі (для changes_since())."""
+        return self._changes.seq
+
+    def changes_since(self, seq: int) -> Optional[List[Change]]:
+        """Зміни після seq (None — занадто давно, споживачу треба перебудуватися)."""
+        return self._changes.since(seq)
+
+    def version(self, name: str) -> int:
+        """Версія контакта: зростає з кожною його зміною в цьому процесі."""
+        return self._changes.version(name.strip().lower())
+
+    def apply_change(self, key: str, record: Optional[Record]) -> None:
+        """
+        Застосувати зміну з журналу (None — контакт видалено).
+
+        Ще не записана локальна зміна того самого контакта має перевагу:
+        вона буде записана пізніше і так чи інакше перезапише цю.
+        """
+        if key in self._changes.pending:
+            return
+        if record is None:
+            kind = DELETED
+            self.data.pop(key, None)
+        else:
+            kind = MODIFIED if key in self.data else CREATED
+            record._owner = self
+            self.data[key] = record
+        # Зміна вже на диску — лише версія та стрічка змін
+        self._changes.record(key, kind, pending=False)
+        self._reindex(key)
+
     def add_record(self, record: Record) -> None:
         """Додати контакт."""
         key = record.name.value.lower()
         if key in self.data:
             raise KeyError(f"Contact '{record.name.value}' already exists.")
         self.data[key] = record
+        record._owner = self
+        self.mark_changed(key, CREATED)
 
     def get_record(self, name: str) -> Record:
-        """Отримати контакт за іменем."""
+        """Отримати контакт за іменем (NotFoundError зі схожими іменами, якщо немає)."""
         key = name.strip().lower()
         if key not in self.data:
-            raise KeyError(name)
+            raise NotFoundError(name, lambda: self.similar_names(name))
         return self.data[key]
 
+    def similar_names(self, name: str, limit: int = FUZZY_MAX_SUGGESTIONS) -> List[str]:
+        """Імена контактів, схожі на name (нечіткий пошук)."""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex(FUZZY_MAX_DISTANCE_NAMES)
+            for key in self.data:
+                self._fuzzy_index.add(key)
+        keys = self._fuzzy_index.lookup(name.strip().lower(), limit)
+        return [self.data[k].name.value for k in keys]
+
     def remove_record(self, name: str) -> bool:
         """Видалити контакт за іменем."""
         key = name.strip().lower()
-        return self.data.pop(key, None) is not None
+        record = self.data.pop(key, None)
+        if record is None:
+            return False
+        record._owner = None
+        self.mark_changed(key, DELETED)
+        return True
 
     def search(self, query: str) -> List[Record]:
-        """Пошук контактів за різними полями."""
-        q = query.lower().strip()
-        results: List[Record] = []
-        for r in self.data.values():
-            hay = [
-                r.name.value.lower(),
-                *(p.value for p in r.phones),
-                *(e.value.lower() for e in r.emails),
-                (r.address.value.lower() if r.address else ""),
-                (r.birthday.value if r.birthday else ""),
-            ]
-            if any(q in h.lower() for h in hay if h):
-                results.append(r)
-        return results
+        """Пошук контактів за підрядком у різних полях (через триграмний індекс)."""
+        if self._search_index is None:
+            self._search_index = TrigramIndex()
+            for key, rec in self.data.items():
+                self._search_index.add(key, rec.search_fields())
+        keys = self._search_index.search(query)
+        return [self.data[k] for k in sorted(keys)]
+
+    def _names(self) -> SortedIndex:
+        """Впорядкований індекс імен (будується при першому зверненні)."""
+        if self._name_index is None:
+            self._name_index = SortedIndex.build((key, key) for key in self.data)
+        return self._name_index
+
+    def names_starting_with(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Імена контактів, що починаються з prefix (без урахування регістру), за алфавітом."""
+        keys = self._names().prefix(prefix.lower(), limit)
+        return [self.data[k].name.value for k in keys]
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Record]:
+        """
+        Сторінка контактів за алфавітом (без сортування всієї книги):
+        записи по одному беруться з підтримуваного індексу імен.
+        """
+        return (self.data[k] for k in self._names().keys(offset, limit))
 
     def all(self) -> List[Record]:
-        """Отримати всі контакти, відсортовані за іменем."""
-        return sorted(self.data.values(), key=lambda r: r.name.value.lower())
+        """Отримати всі контакти, відсортовані за іменем (з підтримуваного індексу, без sorted())."""
+        data = self.data
+        return [data[k] for k in self._names().key_list()]
 
     def upcoming_birthdays(
         self, days: int, today: Optional[date] = None
@@ -301,22 +612,22 @@ class AddressBook(UserDict):
         Повертає: дні_до → список (ім'я, dd.mm.yyyy, день_тижня)
         """
         today = today or date.today()
-        bucket: Dict[int, List[Tuple[str, str, str]]] = {}
-
-        for r in self.data.values():
-            delta = r.days_to_birthday(today)
-            if delta is None or not (0 <= delta <= days):
-                continue
+        if self._birthday_index is None:
+            self._birthday_index = BirthdayCalendar()
+            for key, rec in self.data.items():
+                self._index_birthday(key, rec)
 
-            next_bd = r.get_next_birthday(today)
+        bucket: Dict[int, List[Tuple[str, str, str]]] = {}
+        for delta, next_bd, keys in self._birthday_index.upcoming(today, days):
             wk = next_bd.strftime("%A")
-            bucket.setdefault(delta, []).append((r.name.value, r.birthday.value, wk))
-
-        # Сортуємо кожен список за іменем
-        for d in bucket:
-            bucket[d].sort(key=lambda t: t[0].lower())
-
-        return dict(sorted(bucket.items(), key=lambda kv: kv[0]))
+            items = []
+            for key in keys:
+                r = self.data[key]
+                items.append((r.name.value, r.birthday.value, wk))
+            # Сортуємо кожен список за іменем
+            items.sort(key=lambda t: t[0].lower())
+            bucket[delta] = items
+        return bucket
 
 
 # ==============================
@@ -324,24 +635,80 @@ class AddressBook(UserDict):
 # ==============================
 
 
-@dataclass
 class Note:
-    """Нотатка з текстом та тегами."""
+    """
+    Нотатка з текстом та тегами.
 
-    title: str
-    text: str
-    tags: set[str] = field(default_factory=set)
-    created: datetime = field(default_factory=datetime.now)
+    Звичайний клас з __slots__ замість @dataclass: dataclass(slots=True)
+    недоступний у Python 3.9.
+    """
+
+    __slots__ = ("title", "text", "tags", "created", "_owner")
+
+    def __init__(
+        self,
+        title: str,
+        text: str,
+        tags: Optional[Set[str]] = None,
+        created: Optional[datetime] = None,
+    ) -> None:
+        self.title = title
+        self.text = text
+        self.tags: Set[str] = tags if tags is not None else set()
+        self.created: datetime = created if created is not None else datetime.now()
+        # Записна книжка, що містить нотатку (не серіалізується)
+        self._owner: Optional["NoteBook"] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Note(title={self.title!r}, text={self.text!r}, "
+            f"tags={self.tags!r}, created={self.created!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Note):
+            return NotImplemented
+        return (self.title, self.text, self.tags, self.created) == (
+            other.title, other.text, other.tags, other.created
+        )
+
+    __hash__ = None  # type: ignore[assignment]  # змінний об'єкт, як і dataclass з eq
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return (self.title, self.text, self.tags, self.created)
+
+    def __setstate__(self, state: Any) -> None:
+        if isinstance(state, dict):
+            # Старі знімки (dataclass): словник атрибутів
+            state = (state["title"], state["text"], state.get("tags") or set(), state["created"])
+        self.title, self.text, tags, self.created = state
+        self.tags = {sys.intern(t) for t in tags}
+        self._owner = None
+
+    def _changed(self) -> None:
+        """Повідомити записну книжку про зміну нотатки."""
+        if self._owner is not None:
+            self._owner.mark_changed(self.title)
+
+    def edit_text(self, text: str) -> None:
+        """Замінити текст нотатки."""
+        self.text = text
+        self._changed()
 
     def add_tags(self, *tags: str) -> None:
         """Додати теги до нотатки."""
-        self.tags.update(t.strip().lower() for t in tags if t.strip())
+        # Теги повторюються між нотатками — інтернуємо, щоб рядок зберігався один раз
+        new_tags = {sys.intern(t.strip().lower()) for t in tags if t.strip()} - self.tags
+        if new_tags:
+            self.tags.update(new_tags)
+            self._changed()
 
     def remove_tag(self, tag: str) -> bool:
         """Видалити тег з нотатки."""
         t = tag.strip().lower()
         if t in self.tags:
             self.tags.remove(t)
+            self._changed()
             return True
         return False
 
@@ -349,39 +716,227 @@ class Note:
 class NoteBook(UserDict):
     """Записна книжка (назва → Note)."""
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Незаписані зміни, версії нотаток та стрічка змін
+        self._changes = ChangeTracker()
+        # Індекси будуються при першому пошуку
+        self._text_index: Optional[FullTextIndex] = None
+        self._tag_index: Optional[TagIndex] = None
+        self._title_index: Optional[SortedIndex] = None
+        self._created_index: Optional[SortedIndex] = None
+        self._fuzzy_index: Optional[FuzzyIndex] = None
+        super().__init__(*args, **kwargs)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"data": self.data}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.data = state["data"]
+        self._changes = ChangeTracker()
+        self.reset_indexes()
+        for note in self.data.values():
+            note._owner = self
+
+    def reset_indexes(self) -> None:
+        """Скинути індекси (перебудуються при наступному запиті), напр. після зміни даних ззовні."""
+        self._text_index = None
+        self._tag_index = None
+        self._title_index = None
+        self._created_index = None
+        self._fuzzy_index = None
+
+    def mark_changed(self, title: str, kind: str = MODIFIED) -> None:
+        """Позначити нотатку як створену/змінену/видалену (kind) та оновити індекси."""
+        key = title.strip().lower()
+        self._changes.record(key, kind)
+        self._reindex(key)
+
+    def _reindex(self, key: str) -> None:
+        """Оновити індекси для однієї нотатки (після зміни чи видалення)."""
+        if (
+            self._text_index is None and self._tag_index is None
+            and self._title_index is None and self._created_index is None
+            and self._fuzzy_index is None
+        ):
+            return
+        note = self.data.get(key)
+        if self._title_index is not None:
+            if note is None:
+                self._title_index.remove(key)
+            else:
+                self._title_index.add(key, key)
+        if self._created_index is not None:
+            if note is None:
+                self._created_index.remove(key)
+            else:
+                self._created_index.add(key, note.created)
+        if self._fuzzy_index is not None:
+            if note is None:
+                self._fuzzy_index.remove(key)
+            else:
+                self._fuzzy_index.add(key)
+        if self._text_index is not None:
+            if note is None:
+                self._text_index.remove(key)
+            else:
+                self._text_index.add(key, note.title, note.text)
+        if self._tag_index is not None:
+            if note is None:
+                self._tag_index.remove(key)
+            else:
+                self._tag_index.add(key, note.tags)
+
+    def _tags(self) -> TagIndex:
+        """Індекс тегів (будується при першому зверненні)."""
+        if self._tag_index is None:
+            self._tag_index = TagIndex()
+            for key, note in self.data.items():
+                self._tag_index.add(key, note.tags)
+        return self._tag_index
+
+    def pop_changes(self) -> Dict[str, str]:
+        """Повернути незаписані зміни (ключ → created/modified/deleted) та очистити їх."""
+        return self._changes.pop()
+
+    def pending_changes(self) -> Dict[str, str]:
+        """Зміни нотаток, ще не записані на диск (без очищення)."""
+        return dict(self._changes.pending)
+
+    def replace_data(self, data: Dict[str, Any]) -> None:
+        """
+        Замінити дані свіжими з диска (інший процес записав новий знімок):
+        стрічка змін і версії продовжуються, а не починаються з нуля.
+        """
+        _replace_data(self, data, lambda a, b: a == b)
+
+    def invalidate_changes(self) -> None:
+        """Дані змінено ззовні, але невідомо які (див. ChangeTracker.invalidate())."""
+        self._changes.invalidate()
+
+    def restore_changes(self, changes: Dict[str, str]) -> None:
+        """Повернути зміни з pop_changes(), які не вдалося записати (буде повторено наступним записом)."""
+        self._changes.restore(changes)
+
+    @property
+    def change_seq(self) -> int:
+        """Номер останньої зміни в записній книжці (для changes_since())."""
+        return self._changes.seq
+
+    def changes_since(self, seq: int) -> Optional[List[Change]]:
+        """Зміни після seq (None — занадто давно, споживачу треба перебудуватися)."""
+        return self._changes.since(seq)
+
+    def version(self, title: str) -> int:
+        """Версія нотатки: зростає з кожною її зміною в цьому процесі."""
+        return self._changes.version(title.strip().lower())
+
+    def apply_change(self, key: str, note: Optional[Note]) -> None:
+        """Застосувати зміну з журналу (None — нотатку видалено; локальна незаписана зміна має перевагу)."""
+        if key in self._changes.pending:
+            return
+        if note is None:
+            kind = DELETED
+            self.data.pop(key, None)
+        else:
+            kind = MODIFIED if key in self.data else CREATED
+            note._owner = self
+            self.data[key] = note
+        self._changes.record(key, kind, pending=False)
+        self._reindex(key)
+
     def add(self, note: Note) -> None:
         """Додати нотатку."""
         key = note.title.strip().lower()
         if key in self.data:
             raise KeyError(f"Note '{note.title}' already exists.")
         self.data[key] = note
+        note._owner = self
+        self.mark_changed(key, CREATED)
 
     def get_note(self, title: str) -> Note:
-        """Отримати нотатку за назвою."""
+        """Отримати нотатку за назвою (NotFoundError зі схожими назвами, якщо немає)."""
         key = title.strip().lower()
         if key not in self.data:
-            raise KeyError(title)
+            raise NotFoundError(title, lambda: self.similar_titles(title))
         return self.data[key]
 
+    def similar_titles(self, title: str, limit: int = FUZZY_MAX_SUGGESTIONS) -> List[str]:
+        """Назви нотаток, схожі на title (нечіткий пошук)."""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex(FUZZY_MAX_DISTANCE_NAMES)
+            for key in self.data:
+                self._fuzzy_index.add(key)
+        keys = self._fuzzy_index.lookup(title.strip().lower(), limit)
+        return [self.data[k].title for k in keys]
+
     def remove(self, title: str) -> bool:
         """Видалити нотатку за назвою."""
         key = title.strip().lower()
-        return self.data.pop(key, None) is not None
+        note = self.data.pop(key, None)
+        if note is None:
+            return False
+        note._owner = None
+        self.mark_changed(key, DELETED)
+        return True
 
     def search_text(self, query: str) -> List[Note]:
-        """Пошук нотаток за текстом та назвою."""
-        q = query.lower().strip()
-        return [
-            n for n in self.data.values() if q in n.text.lower() or q in n.title.lower()
-        ]
+        """
+        Повнотекстовий пошук нотаток за текстом та назвою, від найрелевантнішої.
+
+        Підтримує AND/OR, фрази в лапках та префікси (слово*),
+        див. indexes.FullTextIndex.
+        """
+        if self._text_index is None:
+            self._text_index = FullTextIndex()
+            for key, note in self.data.items():
+                self._text_index.add(key, note.title, note.text)
+        return [self.data[k] for k in self._text_index.search(query)]
 
     def search_tag(self, tag: str) -> List[Note]:
         """Пошук нотаток за тегом."""
         t = tag.lower().strip()
-        return [n for n in self.data.values() if t in n.tags]
+        return [self.data[k] for k in sorted(self._tags().keys_for(t))]
+
+    def search_tags(self, query: str) -> List[Note]:
+        """Пошук нотаток за виразом з тегів: work AND urgent NOT done, a OR b."""
+        return [self.data[k] for k in sorted(self._tags().query(query))]
+
+    def tag_counts(self) -> Dict[str, int]:
+        """Кількість нотаток для кожного тегу."""
+        return self._tags().counts()
+
+    def tags_starting_with(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Теги, що починаються з prefix, за алфавітом."""
+        return self._tags().prefix(prefix.lower(), limit)
+
+    def _titles(self) -> SortedIndex:
+        """Впорядкований індекс назв (будується при першому зверненні)."""
+        if self._title_index is None:
+            self._title_index = SortedIndex.build((key, key) for key in self.data)
+        return self._title_index
+
+    def titles_starting_with(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Назви нотаток, що починаються з prefix (без урахування регістру), за алфавітом."""
+        keys = self._titles().prefix(prefix.lower(), limit)
+        return [self.data[k].title for k in keys]
+
+    def _created(self) -> SortedIndex:
+        """Впорядкований індекс дат створення (будується при першому зверненні)."""
+        if self._created_index is None:
+            self._created_index = SortedIndex.build((key, note.created) for key, note in self.data.items())
+        return self._created_index
+
+    def page(self, sort_by: str = "title", offset: int = 0, limit: Optional[int] = None) -> Iterator[Note]:
+        """Сторінка нотаток за назвою або датою створення — записи по одному з підтримуваного індексу."""
+        index = self._created() if sort_by == "created" else self._titles()
+        return (self.data[k] for k in index.keys(offset, limit))
+
+    def created_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Note]:
+        """Нотатки, створені в проміжку start <= created < end (None — без межі), від найстарішої."""
+        return [self.data[k] for k in self._created().range(start, end)]
 
     def all(self, sort_by: str = "title") -> List[Note]:
-        """Отримати всі нотатки з сортуванням."""
-        if sort_by == "created":
-            return sorted(self.data.values(), key=lambda n: n.created)
-        return sorted(self.data.values(), key=lambda n: n.title.lower())
+        """Отримати всі нотатки за назвою або датою створення (з підтримуваних індексів)."""
+        index = self._created() if sort_by == "created" else self._titles()
+        data = self.data
+        return [data[k] for k in index.key_list()]
@@ -0,0 +1,41 @@
+"""
+Розбір рядка команди
+
+Окремий легкий модуль (лише стандартна бібліотека): ним користуються і
+інтерфейс командного рядка (cli.py), і тонкий клієнт демона (daemon.py),
+якому не потрібно імпортувати моделі та сховище.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+import shlex
+
+
+def parse_input(line: str) -> Tuple[str, List[str]]:
+    """
+    Розбити команду на ім'я та аргументи, підтримуючи лапки.
+
+    Приклади:
+        'add "John Doe" 1234567890'
+        → cmd='add', args=['John Doe', '1234567890']
+
+        'add-note "My Note" Some text here'
+        → cmd='add-note', args=['My Note', 'Some', 'text', 'here']
+
+    shlex.split() вміє парсити лапки як у shell:
+    - "текст з пробілами" → один аргумент
+    - текст без лапок → розбивається за пробілами
+    """
+    try:
+        # shlex.split() обробляє лапки як в Unix shell
+        parts = shlex.split(line, posix=True)
+    except ValueError:
+        # Якщо лапки неправильні, просто розбиваємо за пробілами
+        parts = line.split()
+
+    if not parts:
+        return "", []
+    cmd = parts[0].lower()
+    args = parts[1:]
+    return cmd, args
@@ -0,0 +1,433 @@
+"""
+SQLite-бекенд зберігання
+
+Контакти, телефони, email, нотатки та теги лежать у нормалізованих таблицях
+з індексами за нормалізованим ім'ям/назвою, телефоном та тегом.
+AddressBook та NoteBook працюють як «вікна» в базу: запис завантажується
+з бази при першому зверненні, а після команди записуються лише змінені
+контакти/нотатки.
+"""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Set
+import sqlite3
+
+from config import BIRTHDAY_FORMAT
+from models import Address, AddressBook, Birthday, Email, Name, Note, NoteBook, Phone, Record
+from storage import (
+    JOURNAL_FILE,
+    STORAGE_DB_FILE,
+    STORAGE_FILE,
+    PickleBackend,
+    Storage,
+    StorageBackend,
+    ensure_storage_dir,
+    popped_changes,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name_key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    address TEXT,
+    birthday INTEGER  -- порядковий номер дня (Birthday.ordinal)
+);
+CREATE TABLE IF NOT EXISTS phones (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    phone TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_phones_contact ON phones(contact_id);
+CREATE INDEX IF NOT EXISTS idx_phones_phone ON phones(phone);
+CREATE TABLE IF NOT EXISTS emails (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    email TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_emails_contact ON emails(contact_id);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    title_key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS note_tags (
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_note_tags_note ON note_tags(note_id);
+CREATE INDEX IF NOT EXISTS idx_note_tags_tag ON note_tags(tag);
+"""
+
+# PRAGMA user_version поточної схеми: 1 — день народження зберігається як INTEGER
+SCHEMA_VERSION = 1
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Довести базу старішої версії до SCHEMA_VERSION (під storage_lock())."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+    columns = {row["name"]: row["type"] for row in conn.execute("PRAGMA table_info(contacts)")}
+    with conn:
+        if columns.get("birthday", "").upper() == "TEXT":
+            # Версія 0: день народження текстом DD.MM.YYYY, що розбирався при кожному читанні
+            conn.execute("ALTER TABLE contacts RENAME COLUMN birthday TO birthday_text")
+            conn.execute("ALTER TABLE contacts ADD COLUMN birthday INTEGER")
+            rows = conn.execute("SELECT id, birthday_text FROM contacts WHERE birthday_text IS NOT NULL").fetchall()
+            conn.executemany(
+                "UPDATE contacts SET birthday = ? WHERE id = ?",
+                [(datetime.strptime(text, BIRTHDAY_FORMAT).toordinal(), contact_id) for contact_id, text in rows],
+            )
+            conn.execute("ALTER TABLE contacts DROP COLUMN birthday_text")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+class _LazyMap(MutableMapping):
+    """
+    Словник ключ → об'єкт, що підвантажує об'єкти з бази на вимогу.
+
+    Завантажені об'єкти кешуються; видалені ключі пам'ятаються до
+    наступного запису змін у базу.
+    """
+
+    table = ""
+    key_column = ""
+
+    def __init__(self, conn: sqlite3.Connection, owner: Any) -> None:
+        self.conn = conn
+        self.owner = owner
+        self._cache: Dict[str, Any] = {}
+        self._deleted: Set[str] = set()
+        self._complete = False  # чи завантажено всі записи
+
+    @abstractmethod
+    def _fetch(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def _fetch_all(self) -> Iterator[Any]:
+        ...
+
+    @abstractmethod
+    def _key_of(self, obj: Any) -> str:
+        ...
+
+    def _load_all(self) -> None:
+        if self._complete:
+            return
+        for obj in self._fetch_all():
+            key = self._key_of(obj)
+            if key not in self._cache and key not in self._deleted:
+                obj._owner = self.owner
+                self._cache[key] = obj
+        self._complete = True
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._cache:
+            return self._cache[key]
+        if self._complete or key in self._deleted:
+            raise KeyError(key)
+        obj = self._fetch(key)
+        if obj is None:
+            raise KeyError(key)
+        obj._owner = self.owner
+        self._cache[key] = obj
+        return obj
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._cache:
+            return True
+        if self._complete or key in self._deleted:
+            return False
+        row = self.conn.execute(
+            f"SELECT 1 FROM {self.table} WHERE {self.key_column} = ?", (key,)
+        ).fetchone()
+        return row is not None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._deleted.discard(key)
+        self._cache[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._cache.pop(key, None)
+        self._deleted.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_all()
+        return iter(list(self._cache))
+
+    def __len__(self) -> int:
+        if not self._cache and not self._deleted:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        self._load_all()
+        return len(self._cache)
+
+    def values(self):  # type: ignore[override]
+        self._load_all()
+        return self._cache.values()
+
+    def items(self):  # type: ignore[override]
+        self._load_all()
+        return self._cache.items()
+
+    def invalidate(self, keep: Collection[str]) -> None:
+        """
+        Забути кеш після змін бази іншим процесом; записи з ключами keep
+        (ще не записані локальні зміни) залишаються.
+        """
+        self._cache = {key: obj for key, obj in self._cache.items() if key in keep}
+        self._deleted.intersection_update(keep)
+        self._complete = False
+
+    def flushed(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Позначити, що зміни для ключів (None — для всіх) записано в базу."""
+        if keys is None:
+            self._deleted.clear()
+        else:
+            self._deleted.difference_update(keys)
+
+
+class _ContactMap(_LazyMap):
+    table = "contacts"
+    key_column = "name_key"
+
+    def _key_of(self, obj: Record) -> str:
+        return obj.name.value.lower()
+
+    def _build(self, row: sqlite3.Row, phones: List[str], emails: List[str]) -> Record:
+        rec = Record(Name(row["name"]))
+        rec.phones = [Phone(p) for p in phones]
+        rec.emails = [Email(e) for e in emails]
+        if row["address"]:
+            rec.address = Address(row["address"])
+        if row["birthday"]:
+            # Як і unpickle/binformat: з порядкового номера, без strptime
+            # (рядок — лише в базі версії 0, відкритій --read-only без міграції)
+            birthday = object.__new__(Birthday)
+            birthday.__setstate__(row["birthday"])
+            rec.birthday = birthday
+        return rec
+
+    def _fetch(self, key: str) -> Optional[Record]:
+        row = self.conn.execute("SELECT * FROM contacts WHERE name_key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        phones = [p for (p,) in self.conn.execute(
+            "SELECT phone FROM phones WHERE contact_id = ? ORDER BY pos", (row["id"],)
+        )]
+        emails = [e for (e,) in self.conn.execute(
+            "SELECT email FROM emails WHERE contact_id = ? ORDER BY pos", (row["id"],)
+        )]
+        return self._build(row, phones, emails)
+
+    def _fetch_all(self) -> Iterator[Record]:
+        # Телефони та email читаються одним запитом на таблицю, а не на контакт
+        phones: Dict[int, List[str]] = {}
+        for cid, p in self.conn.execute("SELECT contact_id, phone FROM phones ORDER BY contact_id, pos"):
+            phones.setdefault(cid, []).append(p)
+        emails: Dict[int, List[str]] = {}
+        for cid, e in self.conn.execute("SELECT contact_id, email FROM emails ORDER BY contact_id, pos"):
+            emails.setdefault(cid, []).append(e)
+        for row in self.conn.execute("SELECT * FROM contacts").fetchall():
+            yield self._build(row, phones.get(row["id"], []), emails.get(row["id"], []))
+
+
+class _NoteMap(_LazyMap):
+    table = "notes"
+    key_column = "title_key"
+
+    def _key_of(self, obj: Note) -> str:
+        return obj.title.strip().lower()
+
+    def _build(self, row: sqlite3.Row, tags: Set[str]) -> Note:
+        return Note(
+            title=row["title"],
+            text=row["text"],
+            tags=tags,
+            created=datetime.fromisoformat(row["created"]),
+        )
+
+    def _fetch(self, key: str) -> Optional[Note]:
+        row = self.conn.execute("SELECT * FROM notes WHERE title_key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        tags = {t for (t,) in self.conn.execute("SELECT tag FROM note_tags WHERE note_id = ?", (row["id"],))}
+        return self._build(row, tags)
+
+    def _fetch_all(self) -> Iterator[Note]:
+        tags: Dict[int, Set[str]] = {}
+        for nid, t in self.conn.execute("SELECT note_id, tag FROM note_tags"):
+            tags.setdefault(nid, set()).add(t)
+        for row in self.conn.execute("SELECT * FROM notes").fetchall():
+            yield self._build(row, tags.get(row["id"], set()))
+
+
+def _write_contact(conn: sqlite3.Connection, key: str, rec: Optional[Record]) -> None:
+    """Записати (або видалити, якщо rec=None) один контакт."""
+    if rec is None:
+        conn.execute("DELETE FROM contacts WHERE name_key = ?", (key,))
+        return
+    conn.execute(
+        "INSERT INTO contacts (name_key, name, address, birthday) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(name_key) DO UPDATE SET "
+        "name = excluded.name, address = excluded.address, birthday = excluded.birthday",
+        (
+            key,
+            rec.name.value,
+            rec.address.value if rec.address else None,
+            rec.birthday.ordinal if rec.birthday else None,
+        ),
+    )
+    (contact_id,) = conn.execute("SELECT id FROM contacts WHERE name_key = ?", (key,)).fetchone()
+    conn.execute("DELETE FROM phones WHERE contact_id = ?", (contact_id,))
+    conn.execute("DELETE FROM emails WHERE contact_id = ?", (contact_id,))
+    conn.executemany(
+        "INSERT INTO phones (contact_id, pos, phone) VALUES (?, ?, ?)",
+        [(contact_id, i, p.value) for i, p in enumerate(rec.phones)],
+    )
+    conn.executemany(
+        "INSERT INTO emails (contact_id, pos, email) VALUES (?, ?, ?)",
+        [(contact_id, i, e.value) for i, e in enumerate(rec.emails)],
+    )
+
+
+def _write_note(conn: sqlite3.Connection, key: str, note: Optional[Note]) -> None:
+    """Записати (або видалити, якщо note=None) одну нотатку."""
+    if note is None:
+        conn.execute("DELETE FROM notes WHERE title_key = ?", (key,))
+        return
+    conn.execute(
+        "INSERT INTO notes (title_key, title, text, created) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(title_key) DO UPDATE SET "
+        "title = excluded.title, text = excluded.text, created = excluded.created",
+        (key, note.title, note.text, note.created.isoformat()),
+    )
+    (note_id,) = conn.execute("SELECT id FROM notes WHERE title_key = ?", (key,)).fetchone()
+    conn.execute("DELETE FROM note_tags WHERE note_id = ?", (note_id,))
+    conn.executemany(
+        "INSERT INTO note_tags (note_id, tag) VALUES (?, ?)",
+        [(note_id, t) for t in sorted(note.tags)],
+    )
+
+
+class SqliteBackend(StorageBackend):
+    """Бекенд на SQLite з лінивим завантаженням та записом окремих записів."""
+
+    path = STORAGE_DB_FILE
+
+    def __init__(self) -> None:
+        self._conn: Optional[sqlite3.Connection] = None
+        # PRAGMA data_version змінюється, коли базу змінило інше з'єднання
+        self._data_version: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_storage_dir()
+            # З'єднанням користується і фоновий потік запису (background_saves);
+            # записи впорядковує storage_lock()
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(SCHEMA)
+            _migrate(self._conn)
+        return self._conn
+
+    def load(self) -> Storage:
+        # Під блокуванням: перенесення даних з pickle робить лише один процес
+        with self.lock():
+            migrate = not self.path.exists() and (STORAGE_FILE.exists() or JOURNAL_FILE.exists())
+            conn = self._connect()
+            if migrate:
+                # Перший запуск з SQLite: переносимо дані з pickle-знімка
+                self.save(PickleBackend().load())
+            return self._open_books(conn)
+
+    def load_read_only(self) -> Storage:
+        """
+        Без блокування, перенесення даних та створення бази: з'єднання лише
+        для читання (mode=ro; у режимі WAL сам SQLite може створити службові
+        файли -wal/-shm). Якщо бази ще немає — дані pickle-бекенду.
+        """
+        if not self.path.exists():
+            return PickleBackend().load_read_only()
+        self._conn = sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        return self._open_books(self._conn)
+
+    def _open_books(self, conn: sqlite3.Connection) -> Storage:
+        """Книги, що підвантажують записи з бази на вимогу."""
+        contacts = AddressBook()
+        contacts.data = _ContactMap(conn, contacts)
+        notes = NoteBook()
+        notes.data = _NoteMap(conn, notes)
+        self._data_version = self._current_version()
+        return Storage(contacts=contacts, notes=notes)
+
+    def _current_version(self) -> int:
+        return self._connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self, storage: Storage) -> None:
+        """
+        Власні записи з'єднання data_version не змінюють, тож нове значення
+        означає, що базу змінив інший процес: скидаємо кеш та індекси,
+        зберігаючи незаписані локальні зміни. Які саме записи змінено,
+        невідомо, тож стрічка змін обривається (changes_since() → None),
+        а версії всіх записів зростають.
+        """
+        with self.lock():
+            version = self._current_version()
+            if version == self._data_version:
+                return
+            self._data_version = version
+            for book in (storage.contacts, storage.notes):
+                if isinstance(book.data, _LazyMap):
+                    book.data.invalidate(keep=book.pending_changes())
+                    book.reset_indexes()
+                    # Які записи змінено — невідомо: стрічка змін обривається
+                    book.invalidate_changes()
+
+    def save(self, storage: Storage) -> None:
+        # Як і в PickleBackend, запис — під storage_lock(): фоновий потік запису
+        # не читає записи, поки команда їх змінює, а процеси не пишуть разом
+        with self.lock():
+            conn = self._connect()
+            self.refresh(storage)
+            # Невдала транзакція відкочується, а зміни повертаються в книги
+            with popped_changes(storage):
+                contacts: List[Record] = list(storage.contacts.data.values())
+                notes: List[Note] = list(storage.notes.data.values())
+                with conn:
+                    conn.execute("DELETE FROM contacts")
+                    conn.execute("DELETE FROM notes")
+                    for rec in contacts:
+                        _write_contact(conn, rec.name.value.lower(), rec)
+                    for note in notes:
+                        _write_note(conn, note.title.strip().lower(), note)
+            for book in (storage.contacts, storage.notes):
+                if isinstance(book.data, _LazyMap):
+                    book.data.flushed()
+
+    def persist(self, storage: Storage) -> None:
+        with self.lock():
+            conn = self._connect()
+            with popped_changes(storage) as (contact_keys, note_keys):
+                if not contact_keys and not note_keys:
+                    return
+                with conn:
+                    for key in contact_keys:
+                        _write_contact(conn, key, storage.contacts.data.get(key))
+                    for key in note_keys:
+                        _write_note(conn, key, storage.notes.data.get(key))
+            for book, keys in ((storage.contacts, contact_keys), (storage.notes, note_keys)):
+                if isinstance(book.data, _LazyMap):
+                    book.data.flushed(keys)
@@ -0,0 +1,28 @@
+"""
+Спільні фікстури тестів
+
+Шляхи сховища обчислюються при імпорті storage від домашньої папки, тому
+HOME підміняється тимчасовою директорією до першого імпорту модулів проєкту.
+"""
+
+from pathlib import Path
+import os
+import shutil
+import sys
+import tempfile
+
+os.environ["HOME"] = tempfile.mkdtemp(prefix="pacli-tests-")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+import storage  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_storage():
+    """Кожен тест починає з порожньої директорії даних і нового бекенду."""
+    shutil.rmtree(storage.app_storage_dir(), ignore_errors=True)
+    storage._backend = None
+    yield
+    storage._backend = None
@@ -0,0 +1,51 @@
+"""Тести протоколу демона (рядки JSON через потоки asyncio, без сокета)."""
+
+import asyncio
+import json
+
+import pytest
+
+from daemon import _Daemon, _encode
+
+
+class _Writer:
+    """Замість StreamWriter: збирає надіслані байти."""
+
+    def __init__(self):
+        self.data = b""
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _exchange(tmp_path, payload: bytes):
+    """Надіслати байти демону до кінця з'єднання та повернути його відповіді."""
+    server = _Daemon(tmp_path / "daemon.sock")
+    writer = _Writer()
+
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(payload)
+        reader.feed_eof()
+        await server._handle(reader, writer)
+
+    asyncio.run(run())
+    assert writer.closed
+    return [json.loads(line) for line in writer.data.splitlines()]
+
+
+@pytest.mark.parametrize("request_line", [b"[1, 2]\n", b'"all-contacts"\n', b"42\n", b"null\n", b"{not json\n"])
+def test_non_object_request_gets_invalid_request_reply(tmp_path, request_line):
+    replies = _exchange(tmp_path, request_line + _encode({"cmd": "all-contacts", "args": []}))
+
+    assert replies[0]["done"] and replies[0]["error"]
+    assert "Invalid request" in replies[0]["line"]
+    # З'єднання не обривається: наступний коректний запит обслуговується
+    assert replies[-1] == {"done": True, "error": False, "exit": False}
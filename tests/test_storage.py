@@ -0,0 +1,114 @@
+"""Тести знімка та журналу pickle-бекенду."""
+
+import pickle
+
+import storage
+from models import Name, Note, Record
+from storage import JOURNAL_FILE, PickleBackend
+
+
+def _crash_before_journal_unlink(backend: PickleBackend, data: storage.Storage) -> None:
+    """Записати знімок так, ніби процес упав між os.replace() знімка і видаленням журналу."""
+    journal = JOURNAL_FILE.read_bytes()
+    backend.save(data)
+    assert not JOURNAL_FILE.exists()
+    JOURNAL_FILE.write_bytes(journal)
+
+
+def test_stale_journal_is_not_replayed_over_newer_snapshot():
+    backend = PickleBackend()
+    data = backend.load()
+    data.contacts.add_record(Record(Name("Alice")))
+    data.notes.add(Note("Plan", "old text"))
+    backend.save(data)
+
+    # У журналі: новий контакт Bob та видалення нотатки
+    data.contacts.add_record(Record(Name("Bob")))
+    data.notes.remove("Plan")
+    backend.persist(data)
+
+    # Новий знімок: Bob видалений, нотатку створено знову
+    data.contacts.remove_record("Bob")
+    data.notes.add(Note("Plan", "new text"))
+    _crash_before_journal_unlink(backend, data)
+
+    loaded = PickleBackend().load()
+    assert sorted(loaded.contacts.data) == ["alice"]
+    assert loaded.notes.get_note("Plan").text == "new text"
+
+
+def test_stale_journal_is_replaced_on_next_append():
+    backend = PickleBackend()
+    data = backend.load()
+    data.contacts.add_record(Record(Name("Bob")))
+    backend.persist(data)
+    data.contacts.remove_record("Bob")
+    _crash_before_journal_unlink(backend, data)
+
+    other = PickleBackend()
+    data = other.load()
+    data.contacts.add_record(Record(Name("Carol")))
+    other.persist(data)
+
+    loaded = PickleBackend().load()
+    assert sorted(loaded.contacts.data) == ["carol"]
+
+
+def test_journal_is_replayed_over_its_snapshot():
+    backend = PickleBackend()
+    data = backend.load()
+    data.contacts.add_record(Record(Name("Alice")))
+    backend.save(data)
+    data.contacts.add_record(Record(Name("Bob")))
+    backend.persist(data)
+
+    loaded = PickleBackend().load()
+    assert sorted(loaded.contacts.data) == ["alice", "bob"]
+
+
+def _torn_record() -> bytes:
+    """Запис журналу, обірваний посередині (процес упав під час дописування)."""
+    ops = [(storage.JOURNAL_CONTACT, "zed", Record(Name("Zed")))]
+    return pickle.dumps(ops, protocol=pickle.HIGHEST_PROTOCOL)[:-5]
+
+
+def _files():
+    """Файли директорії даних з розмірами (None — директорії немає)."""
+    root = storage.app_storage_dir()
+    if not root.exists():
+        return None
+    return {p.name: p.stat().st_size for p in root.iterdir()}
+
+
+def test_read_only_load_writes_nothing():
+    assert PickleBackend().load_read_only().contacts.data == {}
+    assert _files() is None
+
+    backend = PickleBackend()
+    data = backend.load()
+    data.contacts.add_record(Record(Name("Alice")))
+    backend.persist(data)
+    storage.LOCK_FILE.unlink()
+    with open(JOURNAL_FILE, "ab") as f:
+        f.write(_torn_record())
+    before = _files()
+
+    loaded = PickleBackend().load_read_only()
+    assert sorted(loaded.contacts.data) == ["alice"]
+    assert _files() == before
+
+
+def test_torn_journal_tail_is_cut_by_next_append():
+    backend = PickleBackend()
+    data = backend.load()
+    data.contacts.add_record(Record(Name("Alice")))
+    backend.persist(data)
+    with open(JOURNAL_FILE, "ab") as f:
+        f.write(_torn_record())
+
+    other = PickleBackend()
+    data = other.load()
+    data.contacts.add_record(Record(Name("Bob")))
+    other.persist(data)
+
+    assert sorted(PickleBackend().load().contacts.data) == ["alice", "bob"]
@@ -0,0 +1,21 @@
+"""Тести імпорту контактів."""
+
+from models import AddressBook
+from transfer import FORMAT_JSONL, import_rows, read_rows
+
+
+def test_wrongly_typed_jsonl_field_skips_only_that_row():
+    lines = [
+        '{"name": "Alice", "phones": ["0123456789"]}\n',
+        '{"name": "Bob", "phones": 123}\n',
+        '{"name": "Carol", "emails": [{"work": "carol@example.com"}]}\n',
+        '{"name": "Dave", "address": ["Kyiv"]}\n',
+        '{"name": "Eve", "phone": "0987654321"}\n',
+    ]
+    book = AddressBook()
+    result = import_rows(book, read_rows(lines, FORMAT_JSONL), batch_size=2)
+
+    assert result.added == 2
+    assert result.error_count == 3
+    assert result.errors[0].startswith("line 2: phones")
+    assert sorted(book.data) == ["alice", "eve"]
@@ -0,0 +1,387 @@
+"""
+Масовий імпорт та експорт контактів (CSV, vCard, JSON Lines)
+
+Файли читаються та пишуться потоково — рядок за рядком, тож пам'ять
+не залежить від розміру файлу (окрім самої книги контактів).
+
+Імпорт працює пакетами по IMPORT_BATCH_SIZE записів: спочатку весь пакет
+перевіряється через Phone/Email/Birthday, потім коректні записи зливаються
+в книгу. Контакт з уже наявним ім'ям не дублюється — до нього додаються
+нові телефони/email, а адреса та день народження оновлюються.
+Запис на диск робить команда (@mutating) — один раз після всього імпорту.
+
+Формати:
+- csv   — колонки name,phones,emails,address,birthday;
+          кілька телефонів/email розділяються ';'
+- vcf   — vCard 3.0: FN, TEL, EMAIL, ADR, BDAY (YYYY-MM-DD)
+- jsonl — по одному об'єкту на рядок:
+          {"name": ..., "phones": [...], "emails": [...], "address": ..., "birthday": ...}
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import csv
+import json
+import re
+
+from config import BIRTHDAY_FORMAT, IMPORT_BATCH_SIZE, IMPORT_MAX_ERRORS_SHOWN
+from models import Address, AddressBook, Birthday, Email, Name, Phone, Record
+
+FORMAT_CSV = "csv"
+FORMAT_VCARD = "vcf"
+FORMAT_JSONL = "jsonl"
+
+# Розширення файлу → формат
+_EXTENSIONS = {
+    ".csv": FORMAT_CSV,
+    ".vcf": FORMAT_VCARD,
+    ".vcard": FORMAT_VCARD,
+    ".jsonl": FORMAT_JSONL,
+    ".ndjson": FORMAT_JSONL,
+    ".json": FORMAT_JSONL,
+}
+
+CSV_FIELDS = ["name", "phones", "emails", "address", "birthday"]
+CSV_LIST_SEPARATOR = ";"
+
+# Сирий рядок з файлу: (номер рядка, поле → значення)
+RawRow = Tuple[int, Dict[str, Any]]
+
+
+@dataclass
+class ImportResult:
+    """Підсумок імпорту."""
+
+    added: int = 0
+    merged: int = 0
+    errors: List[str] = field(default_factory=list)
+    error_count: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.added + self.merged
+
+
+def detect_format(path: Path, fmt: Optional[str] = None) -> str:
+    """Визначити формат за явною назвою або розширенням файлу."""
+    if fmt:
+        key = fmt.strip().lower().lstrip(".")
+        key = _EXTENSIONS.get(f".{key}", key)
+        if key in (FORMAT_CSV, FORMAT_VCARD, FORMAT_JSONL):
+            return key
+        raise ValueError(f"Unknown format '{fmt}'. Use csv, vcf or jsonl.")
+    found = _EXTENSIONS.get(path.suffix.lower())
+    if found is None:
+        raise ValueError(f"Cannot detect format of '{path.name}'. Specify csv, vcf or jsonl.")
+    return found
+
+
+# ==============================
+# Читання
+# ==============================
+
+
+def _split_list(value: Any, field: str) -> List[str]:
+    """Список значень з рядка 'a;b' або JSON-масиву рядків (інший тип — ValueError)."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(CSV_LIST_SEPARATOR) if v.strip()]
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return [v.strip() for v in value if v.strip()]
+    raise ValueError(f"{field}: expected a string or a list of strings")
+
+
+def _text(value: Any, field: str) -> str:
+    """Текстове поле ('' — немає); число, масив чи об'єкт з JSON — ValueError."""
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"{field}: expected a string, got {type(value).__name__}")
+    return value.strip()
+
+
+def _read_csv(f: Iterable[str]) -> Iterator[RawRow]:
+    reader = csv.DictReader(f)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _read_jsonl(f: Iterable[str]) -> Iterator[RawRow]:
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError as e:
+            yield line_no, {"_error": f"invalid JSON: {e}"}
+            continue
+        if not isinstance(obj, dict):
+            yield line_no, {"_error": "expected a JSON object"}
+            continue
+        yield line_no, obj
+
+
+# Екранована послідовність vCard: '\n' та '\N' — новий рядок, '\x' — сам символ x
+_VCARD_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+
+def _vcard_split(value: str) -> List[str]:
+    """
+    Розбити ADR/N на складові по ';'.
+
+    Крапка з комою — роздільник, лише якщо перед нею парна кількість
+    зворотних скісних рисок ('\\;' — символ, '\\\\;' — риска й роздільник).
+    """
+    parts = []
+    start = i = 0
+    while i < len(value):
+        ch = value[i]
+        if ch == "\\":
+            i += 2  # пропустити екранований символ
+            continue
+        if ch == ";":
+            parts.append(value[start:i])
+            start = i + 1
+        i += 1
+    parts.append(value[start:])
+    return parts
+
+
+def _vcard_unescape(value: str) -> str:
+    return _VCARD_ESCAPE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def _vcard_escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;")
+        .replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def _vcard_lines(f: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Логічні рядки vCard: продовження (рядок з пробілом/табом на початку) склеюються."""
+    pending: Optional[str] = None
+    pending_no = 0
+    for line_no, raw in enumerate(f, 1):
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending_no, pending
+        pending, pending_no = line, line_no
+    if pending is not None:
+        yield pending_no, pending
+
+
+def _vcard_birthday(value: str) -> str:
+    """BDAY (YYYY-MM-DD або YYYYMMDD) → формат BIRTHDAY_FORMAT."""
+    digits = value.strip().replace("-", "")
+    try:
+        return datetime.strptime(digits[:8], "%Y%m%d").strftime(BIRTHDAY_FORMAT)
+    except ValueError:
+        return value  # хай Birthday поверне зрозумілу помилку
+
+
+def _read_vcard(f: Iterable[str]) -> Iterator[RawRow]:
+    card: Optional[Dict[str, Any]] = None
+    start = 0
+    for line_no, line in _vcard_lines(f):
+        if ":" not in line:
+            continue
+        head, value = line.split(":", 1)
+        prop = head.split(";", 1)[0].split(".")[-1].upper()
+        if prop == "BEGIN" and value.strip().upper() == "VCARD":
+            card, start = {"phones": [], "emails": []}, line_no
+        elif card is None:
+            continue
+        elif prop == "END":
+            yield start, card
+            card = None
+        elif prop == "FN":
+            card["name"] = _vcard_unescape(value)
+        elif prop == "N" and "name" not in card:
+            # N:Прізвище;Ім'я;... — лише якщо немає FN
+            parts = [_vcard_unescape(p) for p in _vcard_split(value)[:2]]
+            card["name"] = " ".join(p for p in reversed(parts) if p)
+        elif prop == "TEL":
+            card["phones"].append(value)
+        elif prop == "EMAIL":
+            card["emails"].append(value)
+        elif prop == "ADR":
+            parts = [_vcard_unescape(p).strip() for p in _vcard_split(value)]
+            card["address"] = ", ".join(p for p in parts if p)
+        elif prop == "BDAY":
+            card["birthday"] = _vcard_birthday(value)
+
+
+_READERS = {FORMAT_CSV: _read_csv, FORMAT_VCARD: _read_vcard, FORMAT_JSONL: _read_jsonl}
+
+
+def read_rows(f: Iterable[str], fmt: str) -> Iterator[RawRow]:
+    """Потоково прочитати сирі рядки з файлу у форматі fmt."""
+    return _READERS[fmt](f)
+
+
+# ==============================
+# Перевірка та злиття
+# ==============================
+
+# Перевірений контакт: (ім'я, телефони, email, адреса, день народження)
+ValidRow = Tuple[Name, List[Phone], List[Email], Optional[Address], Optional[Birthday]]
+
+
+def validate_row(row: Dict[str, Any]) -> ValidRow:
+    """Перевірити один сирий рядок через класи полів (ValueError — некоректні дані)."""
+    if "_error" in row:
+        raise ValueError(row["_error"])
+    name = _text(row.get("name"), "name")
+    if not name:
+        raise ValueError("missing name")
+    phones = [Phone(p) for p in _split_list(row.get("phones") or row.get("phone"), "phones")]
+    emails = [Email(e) for e in _split_list(row.get("emails") or row.get("email"), "emails")]
+    address = _text(row.get("address"), "address")
+    birthday = _text(row.get("birthday"), "birthday")
+    return (
+        Name(name),
+        phones,
+        emails,
+        Address(address) if address else None,
+        Birthday(birthday) if birthday else None,
+    )
+
+
+def _merge(book: AddressBook, row: ValidRow, result: ImportResult) -> None:
+    name, phones, emails, address, birthday = row
+    rec = book.data.get(name.value.lower())
+    if rec is None:
+        rec = Record(name)
+        result.added += 1
+    else:
+        result.merged += 1
+    for phone in phones:
+        rec.add_phone(phone)
+    for email in emails:
+        rec.add_email(email)
+    # Повторний імпорт тих самих даних не позначає контакт зміненим
+    if address is not None and (rec.address is None or rec.address.value != address.value):
+        rec.set_address(address)
+    if birthday is not None and (rec.birthday is None or rec.birthday.ordinal != birthday.ordinal):
+        rec.set_birthday(birthday)
+    if rec._owner is None:
+        book.add_record(rec)
+
+
+def import_rows(
+    book: AddressBook, rows: Iterable[RawRow], batch_size: int = IMPORT_BATCH_SIZE
+) -> ImportResult:
+    """
+    Імпортувати сирі рядки в книгу контактів пакетами.
+
+    Некоректні рядки пропускаються; перші IMPORT_MAX_ERRORS_SHOWN помилок
+    зберігаються в результаті з номерами рядків.
+    """
+    result = ImportResult()
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            break
+        valid: List[ValidRow] = []
+        for line_no, row in batch:
+            try:
+                valid.append(validate_row(row))
+            except ValueError as e:
+                result.error_count += 1
+                if len(result.errors) < IMPORT_MAX_ERRORS_SHOWN:
+                    result.errors.append(f"line {line_no}: {e}")
+        for row in valid:
+            _merge(book, row, result)
+    return result
+
+
+def import_contacts(book: AddressBook, path: Path, fmt: Optional[str] = None) -> ImportResult:
+    """Імпортувати контакти з файлу (формат — за розширенням або явно)."""
+    fmt = detect_format(path, fmt)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return import_rows(book, read_rows(f, fmt))
+
+
+# ==============================
+# Запис
+# ==============================
+
+
+def _write_csv(f: Any, records: Iterable[Record]) -> int:
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    count = 0
+    for rec in records:
+        writer.writerow([
+            rec.name.value,
+            CSV_LIST_SEPARATOR.join(p.value for p in rec.phones),
+            CSV_LIST_SEPARATOR.join(e.value for e in rec.emails),
+            rec.address.value if rec.address else "",
+            rec.birthday.value if rec.birthday else "",
+        ])
+        count += 1
+    return count
+
+
+def _write_jsonl(f: Any, records: Iterable[Record]) -> int:
+    count = 0
+    for rec in records:
+        obj: Dict[str, Any] = {
+            "name": rec.name.value,
+            "phones": [p.value for p in rec.phones],
+            "emails": [e.value for e in rec.emails],
+        }
+        if rec.address:
+            obj["address"] = rec.address.value
+        if rec.birthday:
+            obj["birthday"] = rec.birthday.value
+        f.write(json.dumps(obj, ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def _write_vcard(f: Any, records: Iterable[Record]) -> int:
+    count = 0
+    for rec in records:
+        lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{_vcard_escape(rec.name.value)}"]
+        lines += [f"TEL:{p.value}" for p in rec.phones]
+        lines += [f"EMAIL:{e.value}" for e in rec.emails]
+        if rec.address:
+            lines.append(f"ADR:;;{_vcard_escape(rec.address.value)};;;;")
+        if rec.birthday:
+            lines.append(f"BDAY:{rec.birthday.as_date().isoformat()}")
+        lines.append("END:VCARD")
+        f.write("\r\n".join(lines))
+        f.write("\r\n")
+        count += 1
+    return count
+
+
+_WRITERS = {FORMAT_CSV: _write_csv, FORMAT_VCARD: _write_vcard, FORMAT_JSONL: _write_jsonl}
+
+
+def export_contacts(book: AddressBook, path: Path, fmt: Optional[str] = None) -> int:
+    """
+    Експортувати всі контакти у файл (за алфавітом) та повернути їх кількість.
+
+    Файл пишеться у тимчасовий і замінюється лише після успішного запису.
+    """
+    fmt = detect_format(path, fmt)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        count = _WRITERS[fmt](f, book.page())
+    tmp.replace(path)
+    return count